@@ -1,45 +1,333 @@
-from xai_components.base import InArg, OutArg, Component, xai_component
-from playwright.sync_api import sync_playwright
-from playwright.sync_api import Page
+from xai_components.base import InArg, OutArg, Component, BaseComponent, SubGraphExecutor, xai_component
+from playwright.async_api import async_playwright
+from playwright.async_api import Page, expect
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright, Locator
+import asyncio
+import atexit
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import mimetypes
+import multiprocessing
+import os
 import queue
+import re
+import string
+import sys
 import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+def _patch_playwright_stack_capture():
+    """
+    Replaces Playwright's per-call stack capture with one that stops at the first frame outside Playwright.
+    The API name used in error messages is kept; the caller's frames are no longer recorded for tracing.
+    """
+    from playwright._impl import _connection, _impl_to_api_mapping
+
+    internal_path = _connection._PLAYWRIGHT_MODULE_PATH
+    mapping_file = _impl_to_api_mapping.__file__
+
+    def capture_stack_trace():
+        frame = sys._getframe(2)
+        api_name = ""
+        while frame:
+            filename = frame.f_code.co_filename
+            if filename != mapping_file:
+                if not filename.startswith(internal_path):
+                    break
+                owner = frame.f_locals.get("self")
+                api_name = (owner.__class__.__name__ + "." if owner is not None else "") + frame.f_code.co_name
+            frame = frame.f_back
+        return {"frames": [], "apiName": api_name, "title": None}
+
+    _connection._capture_stack_trace = capture_stack_trace
+
+# Opt-in: skips the full stack walk Playwright does on every API call.
+if os.environ.get("XAI_PW_FAST") == "1":
+    try:
+        _patch_playwright_stack_capture()
+    except (ImportError, AttributeError) as e:
+        logger.warning("XAI_PW_FAST is set but Playwright's stack capture could not be patched: %s", e)
+
+class _ForwardHandler(logging.Handler):
+    """Hands records drained from the log queue to the handlers of the logger they were meant for."""
+    def __init__(self, target):
+        super().__init__()
+        self.target = target
+
+    def emit(self, record):
+        self.target.callHandlers(record)
+
+def _enable_queued_logging():
+    """
+    Routes this module's log records through a queue so the worker thread never blocks on handler I/O.
+    A QueueListener thread formats and writes them with the handlers configured on the root logger.
+    """
+    import logging.handlers
+    import queue
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, _ForwardHandler(logging.getLogger()), respect_handler_level=False)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+# Opt-in: the library does not touch logging configuration unless asked to.
+if os.environ.get("XAI_PW_LOG_QUEUE") == "1":
+    _enable_queued_logging()
 
 class PlaywrightWorker:
+    """
+    Runs Playwright's async API on an asyncio event loop owned by a daemon thread.
+    Components stay synchronous: run() schedules a coroutine function on the loop and waits for its result.
+    """
     def __init__(self):
-        self.task_queue = queue.Queue()
-        self.thread = threading.Thread(target=self._run, daemon=True)
-        self.thread.start()
+        self.loop = asyncio.new_event_loop()
+        self._tls = threading.local()
+        self._pending = {}
+        self._call_counts = weakref.WeakKeyDictionary()
         self._playwright = None
-        self._browser = None
+        self._playwright_start = None
+        self._browsers = {}
+        self._launching = {}
+        self._idle_contexts = collections.deque()
+        self._pooled_contexts = {}
+        self.max_pool_size = int(os.environ.get("XAI_PW_CONTEXT_POOL_SIZE", "4"))
+        self._context = None
         self._page = None
+        self._locators = {}
+        self._locator_ids = {}
+        self._next_locator_id = itertools.count(1)
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
 
-    def _run(self):
-        self._playwright = sync_playwright().start()
-        while True:
-            func, args, kwargs, result_queue = self.task_queue.get()
+    @staticmethod
+    def _order_key(args):
+        # Tasks are ordered per page (their first argument), so a queued wait on one page does not hold up others.
+        return args[0] if args else None
+
+    def _submit(self, func, args, kwargs, entry):
+        # Runs on the loop thread, so self._pending is only ever touched there.
+        self.loop.create_task(self._invoke(self._pending.get(self._order_key(args)), func, args, kwargs, entry))
+
+    async def _invoke(self, pending, func, args, kwargs, entry):
+        slot = entry["slot"]
+        try:
+            if pending is not None:
+                await pending
+            self._count_call(args)
+            slot[1] = await func(*args, **kwargs)
+            slot[0] = True
+        except Exception as e:
+            slot[1] = e
+            slot[0] = False
+        entry["event"].set()
+
+    def _submit_background(self, func, args, kwargs):
+        key = self._order_key(args)
+        task = self.loop.create_task(self._background(self._pending.get(key), func, args, kwargs))
+        self._pending[key] = task
+
+        def forget(done):
+            if self._pending.get(key) is done:
+                del self._pending[key]
+        task.add_done_callback(forget)
+
+    async def _background(self, pending, func, args, kwargs):
+        if pending is not None:
+            await pending
+        try:
+            self._count_call(args)
+            await func(*args, **kwargs)
+        except Exception as e:
+            logger.warning("Background Playwright task failed: %s", e)
+
+    def _count_call(self, args):
+        # Counts the calls started on each page, so an action can tell whether another one ran since its last call.
+        key = self._order_key(args)
+        if key is not None:
             try:
-                result = func(*args, **kwargs)
-                result_queue.put((True, result))
-            except Exception as e:
-                result_queue.put((False, e))
+                self._call_counts[key] = self._call_counts.get(key, 0) + 1
+            except TypeError:
+                pass
+
+    def call_count(self, page):
+        """Returns how many worker calls have been started on page, including the one currently running."""
+        return self._call_counts.get(page, 0)
+
+    def _acquire_result(self):
+        """
+        Returns the calling thread's reusable (event, result slot) pair, creating it on first use.
+        A caller blocks in run() until its result is set, so one pair per thread is enough. If the wait
+        is interrupted, run() discards the pair, so the abandoned call's late result reaches no later call.
+        """
+        try:
+            return self._tls.entry
+        except AttributeError:
+            entry = self._tls.entry = {"event": threading.Event(), "slot": [None, None]}
+            return entry
+
+    @staticmethod
+    def _release_result(entry):
+        entry["event"].clear()
+        entry["slot"][0] = entry["slot"][1] = None
 
     def run(self, func, *args, **kwargs):
-        result_queue = queue.Queue()
-        self.task_queue.put((func, args, kwargs, result_queue))
-        success, result = result_queue.get()
+        """Runs the coroutine function func(*args, **kwargs) on the worker's event loop and returns its result."""
+        entry = self._acquire_result()
+        self.loop.call_soon_threadsafe(self._submit, func, args, kwargs, entry)
+        try:
+            entry["event"].wait()
+        except BaseException:
+            del self._tls.entry
+            raise
+        success, result = entry["slot"]
+        self._release_result(entry)
         if success:
             return result
         else:
             raise result
 
+    def run_async(self, func, *args, **kwargs):
+        """
+        Schedules the coroutine function func on the worker's event loop without waiting for it.
+        Background tasks for the same page (the first argument) run in submission order, and the next
+        run() call for that page waits for them to finish; other pages are not held up.
+        Errors are logged, not raised.
+        """
+        self.loop.call_soon_threadsafe(self._submit_background, func, args, kwargs)
+
+    def run_batch(self, calls):
+        """Runs a list of (func, args, kwargs) coroutine calls on the worker in a single round trip and returns their results."""
+        async def run_all():
+            results = []
+            for func, args, kwargs in calls:
+                pending = self._pending.get(self._order_key(args))
+                if pending is not None:
+                    await pending
+                self._count_call(args)
+                results.append(await func(*args, **kwargs))
+            return results
+        return self.run(run_all)
+
+    def run_parallel(self, calls):
+        """
+        Runs a list of (func, args, kwargs) coroutine calls concurrently on the worker and returns their results in order.
+        Meant for calls on different pages; each call still waits for the background tasks of its own page.
+        """
+        async def run_one(func, args, kwargs):
+            pending = self._pending.get(self._order_key(args))
+            if pending is not None:
+                await pending
+            self._count_call(args)
+            return await func(*args, **kwargs)
+
+        async def run_all():
+            return list(await asyncio.gather(*(run_one(func, args, kwargs) for func, args, kwargs in calls)))
+        return self.run(run_all)
+
     def get_playwright(self):
         return self._playwright
 
-    def set_browser(self, browser):
-        self._browser = browser
+    async def ensure_playwright(self):
+        """Starts Playwright on first use, so creating the worker does not spawn the driver process."""
+        if self._playwright_start is None:
+            self._playwright_start = asyncio.ensure_future(async_playwright().start())
+        self._playwright = await self._playwright_start
+        return self._playwright
 
-    def get_browser(self):
-        return self._browser
+    def preload(self):
+        """Starts Playwright now instead of on the first PlaywrightOpenBrowser."""
+        self.run(self.ensure_playwright)
+
+    def set_browser(self, browser, key=None):
+        self._browsers[key] = browser
+
+    async def ensure_browser(self, key, launch_options):
+        """
+        Returns the browser launched with the given settings (key), launching it with launch_options if
+        there is none. Concurrent flows share one in-flight launch, so only one browser is started per key.
+        """
+        browser = self.get_browser(key)
+        if browser is not None:
+            return browser
+        launching = self._launching.get(key)
+        if launching is None:
+            launching = self._launching[key] = asyncio.ensure_future(self._launch_browser(key, launch_options))
+        return await launching
+
+    async def _launch_browser(self, key, launch_options):
+        try:
+            playwright = await self.ensure_playwright()
+            browser = await playwright.chromium.launch(**launch_options)
+            self.set_browser(browser, key)
+            return browser
+        finally:
+            del self._launching[key]
+
+    def get_browser(self, key=None):
+        """
+        Returns the worker's browser launched with the given settings (key) if it is still connected.
+        The browser stays open between flows, so later PlaywrightOpenBrowser calls skip the launch.
+        """
+        browser = self._browsers.get(key)
+        if browser is None or not browser.is_connected():
+            return None
+        return browser
+
+    def owns_browser(self, browser):
+        return any(b is browser for b in self._browsers.values())
+
+    async def acquire_context(self, browser, key, create):
+        """
+        Returns an idle pooled context of browser created with the same settings (key), most recently
+        released first, or a new one from the create() coroutine function. Give it back with release_context().
+        """
+        for i in range(len(self._idle_contexts) - 1, -1, -1):
+            pooled_browser, pooled_key, context = self._idle_contexts[i]
+            if pooled_browser is browser and pooled_key == key:
+                del self._idle_contexts[i]
+                return context
+        context = await create()
+        self._pooled_contexts[context] = (browser, key)
+        return context
+
+    def is_pooled(self, context):
+        return context in self._pooled_contexts
+
+    async def release_context(self, context):
+        """
+        Closes the pages of a pooled context and clears its cookies, then keeps it for the next acquire_context().
+        Once more than max_pool_size contexts are idle, the least recently used one is closed.
+        """
+        browser, key = self._pooled_contexts[context]
+        for page in context.pages:
+            await page.close()
+        await context.clear_cookies()
+        self._idle_contexts.append((browser, key, context))
+        while len(self._idle_contexts) > self.max_pool_size:
+            _, _, evicted = self._idle_contexts.popleft()
+            del self._pooled_contexts[evicted]
+            await evicted.close()
+
+    def discard_context(self, context):
+        self._pooled_contexts.pop(context, None)
+
+    def set_context(self, context):
+        self._context = context
+
+    def get_context(self):
+        return self._context
 
     def set_page(self, page):
         self._page = page
@@ -47,49 +335,542 @@ class PlaywrightWorker:
     def get_page(self):
         return self._page
 
+    def add_locator(self, locator):
+        """Registers a locator and returns its integer handle; registering the same locator again returns the same handle."""
+        locator_id = self._locator_ids.get(locator)
+        if locator_id is None:
+            locator_id = next(self._next_locator_id)
+            self._locators[locator_id] = locator
+            self._locator_ids[locator] = locator_id
+        return locator_id
+
+    def get_locator(self, locator_id):
+        try:
+            return self._locators[locator_id]
+        except KeyError:
+            raise ValueError(f"Unknown or freed locator handle: {locator_id}")
+
+    def free_locator(self, locator_id):
+        locator = self._locators.pop(locator_id, None)
+        if locator is not None:
+            self._locator_ids.pop(locator, None)
+
+    def free_page_locators(self, page):
+        for locator_id, locator in list(self._locators.items()):
+            if locator.page is page:
+                self.free_locator(locator_id)
+
+    def stop(self):
+        """Closes the worker's browsers, stops Playwright and the event loop. Registered with atexit so no browser process is leaked."""
+        async def shutdown():
+            for browser in self._browsers.values():
+                if browser.is_connected():
+                    await browser.close()
+            self._browsers.clear()
+            self._idle_contexts.clear()
+            self._pooled_contexts.clear()
+            _DEFAULT_CONTEXT.clear()
+            self._context = None
+            self._page = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            self._playwright_start = None
+
+        if self.thread.is_alive():
+            self.run(shutdown)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+def _process_worker_main(requests, responses, headless):
+    """Entry point of a PlaywrightProcessWorker process: owns one browser page and serves requests until "close"."""
+    try:
+        playwright = sync_playwright().start()
+        browser = playwright.chromium.launch(headless=headless)
+        page = browser.new_page()
+    except Exception as e:
+        responses.put((False, f"{type(e).__name__}: {e}"))
+        return
+    responses.put((True, None))
+    locators = {}
+    next_id = itertools.count(1)
+
+    def to_wire(result):
+        # Locators stay in this process; the caller gets an id it can send back.
+        if isinstance(result, Locator):
+            locator_id = next(next_id)
+            locators[locator_id] = result
+            return locator_id
+        if result is None or isinstance(result, (bool, int, float, str, bytes, list, dict)):
+            return result
+        return None
+
+    while True:
+        op, target, method, args, kwargs = requests.get()
+        if op == "close":
+            browser.close()
+            playwright.stop()
+            responses.put((True, None))
+            return
+        try:
+            if op == "page":
+                obj = page
+            elif op == "keyboard":
+                obj = page.keyboard
+            elif op == "mouse":
+                obj = page.mouse
+            elif op == "locator":
+                obj = locators[target]
+            elif op == "free":
+                locators.pop(target, None)
+                responses.put((True, None))
+                continue
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+            responses.put((True, to_wire(getattr(obj, method)(*args, **kwargs))))
+        except Exception as e:
+            responses.put((False, f"{type(e).__name__}: {e}"))
+
+class PlaywrightProcessWorker:
+    """
+    Opt-in alternative to PlaywrightWorker that runs Playwright in its own process, so several
+    workers can drive their browsers in parallel instead of sharing one thread and the GIL.
+
+    Live Playwright objects cannot be pickled, so calls are sent by name with picklable arguments:
+    - page(method, *args, **kwargs): calls a page method, e.g. page("goto", "https://example.com").
+    - keyboard(...) / mouse(...): same for page.keyboard and page.mouse.
+    - locator(locator_id, method, *args, **kwargs): calls a method on a locator created earlier.
+    Methods returning a locator (page("locator", "#id"), page("get_by_role", "button")) return an
+    integer id for it instead; free(locator_id) releases it. Other non-picklable results come back as None.
+    """
+    def __init__(self, headless=False):
+        mp_context = multiprocessing.get_context("spawn")
+        self._requests = mp_context.Queue()
+        self._responses = mp_context.Queue()
+        self._lock = threading.Lock()
+        self.process = mp_context.Process(target=_process_worker_main,
+                                          args=(self._requests, self._responses, headless), daemon=True)
+        self.process.start()
+        success, error = self._receive()
+        if not success:
+            self.process.join()
+            raise RuntimeError(f"Could not start the Playwright process: {error}")
+        atexit.register(self.stop)
+
+    def _receive(self):
+        # Polls, so a caller does not block forever when the child process has crashed (e.g. the browser ran out of memory).
+        while self.process.is_alive():
+            try:
+                return self._responses.get(timeout=1.0)
+            except queue.Empty:
+                pass
+        # The child may have answered just before it exited.
+        try:
+            return self._responses.get(timeout=1.0)
+        except queue.Empty:
+            raise RuntimeError(f"The Playwright process exited unexpectedly (exit code {self.process.exitcode}).")
+
+    def _call(self, op, target=None, method=None, args=(), kwargs=None):
+        with self._lock:
+            self._requests.put((op, target, method, args, kwargs or {}))
+            success, result = self._receive()
+        if success:
+            return result
+        raise RuntimeError(result)
+
+    def page(self, method, *args, **kwargs):
+        return self._call("page", None, method, args, kwargs)
+
+    def keyboard(self, method, *args, **kwargs):
+        return self._call("keyboard", None, method, args, kwargs)
+
+    def mouse(self, method, *args, **kwargs):
+        return self._call("mouse", None, method, args, kwargs)
+
+    def locator(self, locator_id, method, *args, **kwargs):
+        return self._call("locator", locator_id, method, args, kwargs)
+
+    def free(self, locator_id):
+        self._call("free", locator_id)
+
+    def stop(self):
+        if self.process.is_alive():
+            try:
+                self._call("close")
+            except RuntimeError as e:
+                logger.warning("Could not close the Playwright process cleanly: %s", e)
+            self.process.join()
+
 global_worker = None
 
+_SELECTOR_CACHE = {}
+
+def _parse_selector(selector):
+    """
+    Splits a selector into (literal, field name) parts.
+    Returns None when the selector needs the full str.format syntax (format specs, conversions,
+    attribute or index lookups), in which case it is formatted with str.format instead.
+    """
+    parts = []
+    try:
+        for literal, field, spec, conversion in string.Formatter().parse(selector):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                return None
+            parts.append((literal, field))
+    except ValueError:
+        return None
+    return tuple(parts)
+
+def _get_or(port, default):
+    """Returns the port's value, or default when it is not set."""
+    value = port.value
+    return default if value is None else value
+
+def _format_selector(selector, ctx):
+    """Fills `{placeholders}` in a CSS selector from the context. Each selector is parsed only once."""
+    try:
+        parts = _SELECTOR_CACHE[selector]
+    except KeyError:
+        parts = _SELECTOR_CACHE[selector] = _parse_selector(selector)
+    try:
+        if parts is None:
+            return selector.format(**ctx)
+        return "".join(literal if field is None else literal + format(ctx[field]) for literal, field in parts)
+    except Exception as e:
+        raise ValueError(f"Error formatting selector: {selector}. Error: {e}")
+
+def _locate(p, selector="", role="", name="", label=""):
+    """Resolves a locator on page `p` from a CSS selector, a role with optional name, or a label."""
+    if selector:
+        logger.debug("Identifying element using CSS selector: %s", selector)
+        return p.locator(selector)
+    elif role:
+        logger.debug("Identifying element using role: %s %s", role, 'with name: ' + name if name else '')
+        if name:
+            return p.get_by_role(role, name=name)
+        else:
+            return p.get_by_role(role)
+    elif label:
+        logger.debug("Identifying element using label: %s", label)
+        return p.get_by_label(label)
+    else:
+        raise ValueError("Must provide at least one locator method (selector, role, or label).")
+
+_LOCATOR_CACHE_SIZE = 512
+
+def _cached_locate(p, ctx, selector="", role="", name="", label=""):
+    """
+    Same as _locate, but returns the locator of an earlier identical lookup on the same page and URL.
+    Each page keeps its _LOCATOR_CACHE_SIZE most recently used locators; the cache is cleared
+    whenever one of the page's frames navigates, and dropped by PlaywrightCloseBrowser.
+    """
+    page_caches = ctx.setdefault("_locator_cache", {})
+    cache = page_caches.get(p)
+    if cache is None:
+        cache = page_caches[p] = collections.OrderedDict()
+        p.on("framenavigated", lambda frame: cache.clear())
+
+    key = (selector, role, name, label, p.url)
+    locator_obj = cache.get(key)
+    if locator_obj is None:
+        locator_obj = cache[key] = _locate(p, selector, role, name, label)
+        if len(cache) > _LOCATOR_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+        logger.debug("Reusing cached locator.")
+    return locator_obj
+
+def _resolve_locator(value):
+    """Returns the locator behind an integer handle from IdentifyElement; any other value is returned unchanged."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return global_worker.get_locator(value)
+    return value
+
+def _dispatch(ctx, func, *args, wait=True):
+    """
+    Runs func on the worker, or queues it when called inside a PlaywrightBatch body.
+    With wait=False the call is submitted without waiting for its result.
+    """
+    batch = ctx.get("_pw_batch")
+    if batch is not None:
+        batch.append((func, args, {}))
+        return None
+    if not wait:
+        return global_worker.run_async(func, *args)
+    return global_worker.run(func, *args)
+
+def _flush_batch(ctx):
+    """Inside a PlaywrightBatch body, sends the actions queued so far to the worker and waits for them."""
+    batch = ctx.get("_pw_batch")
+    if batch:
+        global_worker.run_batch(list(batch))
+        batch.clear()
+
+def _run(ctx, func, *args):
+    """
+    Runs func on the worker and returns its result. Inside a PlaywrightBatch body, the actions queued
+    so far are sent first, so func sees their effects, e.g. a screenshot after queued fills.
+    """
+    _flush_batch(ctx)
+    return global_worker.run(func, *args)
+
+_WORKER_LOCK = threading.Lock()
+
+def _get_global_worker():
+    global global_worker
+    if global_worker is None:
+        with _WORKER_LOCK:
+            if global_worker is None:
+                worker = PlaywrightWorker()
+                atexit.register(worker.stop)
+                global_worker = worker
+    return global_worker
+
+# Long-running servers can pay the driver start-up cost at import instead of on the first flow.
+if os.environ.get("XAI_PW_PRELOAD") == "1":
+    _get_global_worker().preload()
+
+# Shared browser context of each browser, used by PlaywrightOpenBrowser with reuse_context.
+_DEFAULT_CONTEXT = {}
+# In-flight creations of those contexts, so concurrent flows wait for the same one.
+_DEFAULT_CONTEXT_CREATION = {}
+
+async def _get_default_context(browser, create):
+    """Returns the shared context of browser, creating it with the create() coroutine function if there is none."""
+    context = _DEFAULT_CONTEXT.get(browser)
+    if context is not None:
+        return context
+    creating = _DEFAULT_CONTEXT_CREATION.get(browser)
+    if creating is None:
+        creating = _DEFAULT_CONTEXT_CREATION[browser] = asyncio.ensure_future(_create_default_context(browser, create))
+    return await creating
+
+async def _create_default_context(browser, create):
+    try:
+        context = _DEFAULT_CONTEXT[browser] = await create()
+        return context
+    finally:
+        del _DEFAULT_CONTEXT_CREATION[browser]
+
+# Accept buttons of common consent managers (OneTrust, Cookiebot, Didomi, TrustArc, Quantcast, Google Funding Choices, Usercentrics).
+_COOKIE_BANNER_SELECTORS = (
+    "#onetrust-accept-btn-handler",
+    "#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll",
+    "#CybotCookiebotDialogBodyButtonAccept",
+    "#didomi-notice-agree-button",
+    "#truste-consent-button",
+    ".qc-cmp2-summary-buttons button[mode='primary']",
+    ".fc-cta-consent",
+    "[data-testid='uc-accept-all-button']",
+)
+
+# Runs in every page and frame of the context before the site's scripts. It clicks the first visible
+# accept button, checking at most once per animation frame while the DOM changes, for up to 15 seconds.
+_DISMISS_COOKIE_BANNERS_JS = """
+(() => {
+  const selectors = %s;
+  let observer = null;
+  let scheduled = false;
+
+  function dismiss() {
+      scheduled = false;
+      for (const selector of selectors) {
+          const button = document.querySelector(selector);
+          if (button && button.getClientRects().length) {
+              button.click();
+              if (observer) {
+                  observer.disconnect();
+              }
+              return true;
+          }
+      }
+      return false;
+  }
+
+  function start() {
+      if (dismiss()) {
+          return;
+      }
+      observer = new MutationObserver(() => {
+          if (!scheduled) {
+              scheduled = true;
+              requestAnimationFrame(dismiss);
+          }
+      });
+      observer.observe(document.documentElement, { childList: true, subtree: true });
+      setTimeout(() => observer.disconnect(), 15000);
+  }
+
+  if (document.readyState === "loading") {
+      document.addEventListener("DOMContentLoaded", start, { once: true });
+  } else {
+      start();
+  }
+})();
+""" % json.dumps(list(_COOKIE_BANNER_SELECTORS))
+
 @xai_component
 class PlaywrightOpenBrowser(Component):
     """Opens a Playwright browser and navigates to a specified URL using a dedicated worker thread.
+    The browser is launched once and shared; every call opens its page in a fresh browser context,
+    unless reuse_context is set.
 
     ##### inPorts:
     - url: The URL to visit.
     - headless: Whether to run the browser in headless mode (default: False).
+    - args: (Optional) A list of extra Chromium command line switches,
+            e.g. ["--disable-dev-shm-usage", "--blink-settings=imagesEnabled=false"].
+    - channel: (Optional) The browser distribution channel to launch, e.g. "chrome" or "msedge".
+    - user_agent: (Optional) The user agent string for the browser context.
+    - extra_http_headers: (Optional) A dictionary of HTTP headers sent with every request of the context.
+    - timeout: (Optional) Default timeout in milliseconds for actions and navigations of the context.
+    - block_domains: (Optional) A list of domains (e.g. ["doubleclick.net"]) whose requests are aborted,
+                     including their subdomains. Useful to skip ads and analytics.
+    - record_network: (Optional) If True, every request and response of the page is appended to
+                      ctx["_net_log"] as (perf_counter time, "request"/"response", method/status, url) (default: False).
+    - reuse_context: (Optional) If True, open the page in the browser's shared context instead of a new one,
+                     keeping cookies and storage between flows and skipping the context setup (default: False).
+                     The context options above only apply when the shared context is first created.
+    - dismiss_cookie_banners: (Optional) If True, pages of the context click the accept button of common cookie
+                              consent banners as soon as one appears, so the flow needs no click step per site (default: False).
+    - pool_context: (Optional) If True, take an idle context with the same options from the worker's context pool,
+                    and have PlaywrightCloseBrowser return it there instead of closing it (default: False).
+                    Its pages are closed and its cookies cleared on return; other storage is kept.
 
     ##### outPorts:
     - page: The Playwright page instance.
     - browser: The Playwright browser instance.
+    - context: The Playwright browser context the page belongs to.
     - worker: The PlaywrightWorker instance (for reuse in subsequent components).
     """
     url: InArg[str]
     headless: InArg[bool]
+    args: InArg[list]
+    channel: InArg[str]
+    user_agent: InArg[str]
+    extra_http_headers: InArg[dict]
+    timeout: InArg[int]
+    block_domains: InArg[list]
+    record_network: InArg[bool]
+    reuse_context: InArg[bool]
+    dismiss_cookie_banners: InArg[bool]
+    pool_context: InArg[bool]
     page: OutArg[Page]
     browser: OutArg[any]
+    context: OutArg[any]
     worker: OutArg[any]
 
     def execute(self, ctx) -> None:
         global global_worker
-        if global_worker is None:
-            global_worker = PlaywrightWorker()  
-
-        headless_mode = self.headless.value if self.headless.value is not None else False
-
-        def open_browser():
-            browser = global_worker.get_playwright().chromium.launch(headless=headless_mode)
-            page = browser.new_page()
-            page.goto(self.url.value)
-            global_worker.set_browser(browser)
+        _get_global_worker()
+
+        headless_mode = _get_or(self.headless, False)
+        timeout_value = self.timeout.value
+
+        launch_options = {"headless": headless_mode}
+        if self.args.value:
+            launch_options["args"] = list(self.args.value)
+        if self.channel.value:
+            launch_options["channel"] = self.channel.value
+        # A browser is shared only with flows that launch it with the same options.
+        browser_key = (headless_mode, tuple(launch_options.get("args", ())), launch_options.get("channel"))
+
+        # Context settings are passed to new_context() so they travel with the single
+        # context creation call instead of one driver round trip per setter.
+        context_options = {}
+        if self.user_agent.value:
+            context_options["user_agent"] = self.user_agent.value
+        if self.extra_http_headers.value:
+            context_options["extra_http_headers"] = self.extra_http_headers.value
+
+        block_pattern = None
+        if self.block_domains.value:
+            # Only requests to blocked hosts match, so other requests never round-trip through Python.
+            domains = "|".join(re.escape(d) for d in self.block_domains.value)
+            block_pattern = re.compile(rf"^[a-z]+://([^/?#]*\.)?({domains})(:\d+)?([/?#]|$)", re.IGNORECASE)
+        net_log = ctx.setdefault("_net_log", []) if self.record_network.value else None
+        reuse_context_value = _get_or(self.reuse_context, False)
+        dismiss_banners_value = _get_or(self.dismiss_cookie_banners, False)
+        pool_key = None
+        if _get_or(self.pool_context, False):
+            # Only contexts created with the same settings are handed out again.
+            pool_key = repr((sorted(context_options.items()), timeout_value, self.block_domains.value, dismiss_banners_value))
+
+        async def create_context(browser):
+            context = await browser.new_context(**context_options)
+            if timeout_value is not None:
+                # Sent to the driver without waiting for a reply.
+                context.set_default_timeout(timeout_value)
+            if block_pattern is not None:
+                await context.route(block_pattern, lambda route: route.abort())
+            if dismiss_banners_value:
+                await context.add_init_script(_DISMISS_COOKIE_BANNERS_JS)
+            return context
+
+        async def open_browser():
+            browser = await global_worker.ensure_browser(browser_key, launch_options)
+            if reuse_context_value:
+                context = await _get_default_context(browser, lambda: create_context(browser))
+            elif pool_key is not None:
+                context = await global_worker.acquire_context(browser, pool_key, lambda: create_context(browser))
+            else:
+                context = await create_context(browser)
+            page = await context.new_page()
+            if net_log is not None:
+                page.on("request", lambda r: net_log.append((time.perf_counter(), "request", r.method, r.url)))
+                page.on("response", lambda r: net_log.append((time.perf_counter(), "response", r.status, r.url)))
+            await page.goto(self.url.value)
+            global_worker.set_context(context)
             global_worker.set_page(page)
-            return (browser, page)
+            return (browser, context, page)
 
-        browser, page = global_worker.run(open_browser)
+        browser, context, page = _run(ctx, open_browser)
         self.browser.value = browser
+        self.context.value = context
         self.page.value = page
         self.worker.value = global_worker
         ctx["browser"] = browser
+        ctx["context"] = context
         ctx["page"] = page
-        print(f"Browser opened and navigated to: {self.url.value} | Headless: {headless_mode}")
+        logger.info("Browser opened and navigated to: %s | Headless: %s", self.url.value, headless_mode)
+
+@xai_component
+class PlaywrightNewPage(Component):
+    """
+    Opens another page in an existing browser context, e.g. the context output of PlaywrightOpenBrowser,
+    so a flow can work in several tabs without launching a browser or creating a context.
+    The new page becomes the default page for the following components.
+
+    ##### inPorts:
+    - context: (Optional) The Playwright browser context. Retrieved from the context if not provided.
+    - url: (Optional) The URL to open in the new page.
+
+    ##### outPorts:
+    - page: The new Playwright page instance.
+    """
+    context: InArg[any]
+    url: InArg[str]
+    page: OutArg[Page]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        context_obj = _get_or(self.context, ctx.get("context"))
+        url_value = self.url.value
+
+        if not context_obj:
+            raise ValueError("Missing browser context. Run PlaywrightOpenBrowser first or provide a context.")
+
+        async def new_page():
+            page = await context_obj.new_page()
+            if url_value:
+                await page.goto(url_value)
+            return page
+
+        page = _run(ctx, new_page)
+        self.page.value = page
+        ctx["page"] = page
+        logger.info("Opened a new page in the browser context: %s", url_value or "about:blank")
 
 @xai_component
 class PlaywrightIdentifyElement(Component):
@@ -103,9 +884,12 @@ class PlaywrightIdentifyElement(Component):
     - role: The role of the element (optional).
     - name: The accessible name for role (optional).
     - label: The label text (optional).
+    - as_handle: (Optional) If True, output an integer handle instead of the locator object (default: False).
+                 Every component taking a locator accepts the handle. The worker keeps the locator until
+                 PlaywrightFreeLocator frees the handle or PlaywrightCloseBrowser closes the page.
 
     outPorts:
-    - locator: The identified Playwright locator.
+    - locator: The identified Playwright locator, or its handle.
     - out_page: The unchanged Playwright page instance.
     """
     page: InArg[Page]
@@ -113,44 +897,63 @@ class PlaywrightIdentifyElement(Component):
     role: InArg[str]
     name: InArg[str]
     label: InArg[str]
+    as_handle: InArg[bool]
     out_page: OutArg[Page]
     locator: OutArg[any]
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        selector_value = self.selector.value if self.selector.value is not None else ""
-        role_value = self.role.value if self.role.value is not None else ""
-        name_value = self.name.value if self.name.value is not None else ""
-        label_value = self.label.value if self.label.value is not None else ""
+        page_obj = _get_or(self.page, ctx.get("page"))
+        selector_value = _get_or(self.selector, "")
+        role_value = _get_or(self.role, "")
+        name_value = _get_or(self.name, "")
+        label_value = _get_or(self.label, "")
 
         if not page_obj:
             raise ValueError("No valid Playwright page instance provided.")
 
-        def identify(p):
-            if selector_value:
-                try:
-                    formatted_selector = selector_value.format(**ctx)
-                except Exception as e:
-                    raise ValueError(f"Error formatting selector: {selector_value}. Error: {e}")
-                print(f"Identifying element using CSS selector: {formatted_selector}")
-                return p.locator(formatted_selector)
-            elif role_value:
-                print(f"Identifying element using role: {role_value} {'with name: ' + name_value if name_value else ''}")
-                if name_value:
-                    return p.get_by_role(role_value, name=name_value)
-                else:
-                    return p.get_by_role(role_value)
-            elif label_value:
-                print(f"Identifying element using label: {label_value}")
-                return p.get_by_label(label_value)
-            else:
-                raise ValueError("Must provide at least one locator method (selector, role, or label).")
-        
+        if selector_value:
+            selector_value = _format_selector(selector_value, ctx)
+
+        async def identify(p):
+            return _cached_locate(p, ctx, selector_value, role_value, name_value, label_value)
+
+        # Creating a locator does not touch the page, so actions queued by a PlaywrightBatch need not be sent first.
         result_locator = global_worker.run(identify, page_obj)
+        if _get_or(self.as_handle, False):
+            result_locator = global_worker.add_locator(result_locator)
         self.locator.value = result_locator
         self.out_page.value = page_obj
-        print("Element identified successfully.")
+        logger.debug("Element identified successfully.")
+
+# Component actions are module-level coroutine functions that take their values as arguments,
+# so execute() passes them to the worker instead of building a closure on every call.
+async def _do_click(p, ctx, selector, locator_obj, position_value, double_click_value):
+    target = _cached_locate(p, ctx, selector) if selector else locator_obj
+    if position_value and not target:
+        if double_click_value:
+            await p.mouse.dblclick(position_value["x"], position_value["y"])
+            logger.debug("Double clicked at position %s on the page.", position_value)
+        else:
+            await p.mouse.click(position_value["x"], position_value["y"])
+            logger.debug("Clicked at position %s on the page.", position_value)
+    elif target:
+        if position_value:
+            if double_click_value:
+                await target.dblclick(position=position_value)
+                logger.debug("Double clicked on element at position %s.", position_value)
+            else:
+                await target.click(position=position_value)
+                logger.debug("Clicked on element at position %s.", position_value)
+        else:
+            if double_click_value:
+                await target.dblclick()
+                logger.debug("Double clicked on element.")
+            else:
+                await target.click()
+                logger.debug("Clicked on element.")
+    else:
+        raise ValueError("You must provide either a locator or a valid position dictionary.")
 
 @xai_component
 class PlaywrightClickElement(Component):
@@ -176,55 +979,31 @@ class PlaywrightClickElement(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
+        page_obj = _get_or(self.page, ctx.get("page"))
 
-        raw_locator = self.locator.value if self.locator.value is not None else None
-        locator_obj = None
+        raw_locator = _resolve_locator(self.locator.value)
+        formatted_selector = None
         if raw_locator and isinstance(raw_locator, str):
-            try:
-                formatted_selector = raw_locator.format(**ctx)
-            except Exception as e:
-                raise ValueError(f"Error in formatting selector: {raw_locator}. Error: {e}")
-            locator_obj = page_obj.locator(formatted_selector)
-            print(f"Using formatted selector: {formatted_selector}")
-        else:
-            locator_obj = raw_locator
+            formatted_selector = _format_selector(raw_locator, ctx)
+            logger.debug("Using formatted selector: %s", formatted_selector)
 
-        double_click_value = self.double_click.value if self.double_click.value is not None else False
-        position_value = self.position.value if self.position.value is not None else {}
+        double_click_value = _get_or(self.double_click, False)
+        position_value = _get_or(self.position, {})
 
         if not page_obj:
             raise ValueError("Missing Playwright page instance.")
 
-        def click_action(p):
-            if position_value and not locator_obj:
-                if double_click_value:
-                    p.mouse.dblclick(position_value["x"], position_value["y"])
-                    print(f"Double clicked at position {position_value} on the page.")
-                else:
-                    p.mouse.click(position_value["x"], position_value["y"])
-                    print(f"Clicked at position {position_value} on the page.")
-            elif locator_obj:
-                if position_value:
-                    if double_click_value:
-                        locator_obj.dblclick(position=position_value)
-                        print(f"Double clicked on element at position {position_value}.")
-                    else:
-                        locator_obj.click(position=position_value)
-                        print(f"Clicked on element at position {position_value}.")
-                else:
-                    if double_click_value:
-                        locator_obj.dblclick()
-                        print("Double clicked on element.")
-                    else:
-                        locator_obj.click()
-                        print("Clicked on element.")
-            else:
-                raise ValueError("You must provide either a locator or a valid position dictionary.")
-
-        global_worker.run(click_action, page_obj)
+        _dispatch(ctx, _do_click, page_obj, ctx, formatted_selector, raw_locator, position_value, double_click_value)
         self.out_page.value = page_obj
 
+async def _do_fill(p, locator_obj, text_value, sequential_value, delay_value):
+    if sequential_value:
+        await locator_obj.press_sequentially(text_value, delay=delay_value)
+        logger.debug("Typed text sequentially with delay %sms on the identified element. Text: %s", delay_value, text_value)
+    else:
+        await locator_obj.fill(text_value)
+        logger.debug("Filled element with text: %s", text_value)
+
 @xai_component
 class PlaywrightFillInput(Component):
     """
@@ -250,26 +1029,26 @@ class PlaywrightFillInput(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
         text_value = self.text.value
-        sequential_value = self.sequential.value if self.sequential.value is not None else False
-        delay_value = self.delay.value if self.delay.value is not None else 0
+        sequential_value = _get_or(self.sequential, False)
+        delay_value = _get_or(self.delay, 0)
 
         if not page_obj or not locator_obj:
             raise ValueError("Missing page instance or locator.")
 
-        def fill_action(p):
-            if sequential_value:
-                locator_obj.press_sequentially(text_value, delay=delay_value)
-                print(f"Typed text sequentially with delay {delay_value}ms on the identified element. Text: {text_value}")
-            else:
-                locator_obj.fill(text_value)
-                print(f"Filled element with text: {text_value}")
-
-        global_worker.run(fill_action, page_obj)
+        _dispatch(ctx, _do_fill, page_obj, locator_obj, text_value, sequential_value, delay_value)
         self.out_page.value = page_obj
 
+async def _do_press(p, locator_obj, key_value):
+    if locator_obj:
+        await locator_obj.press(key_value)
+        logger.debug("Pressed key: %s on the identified element.", key_value)
+    else:
+        await p.keyboard.press(key_value)
+        logger.debug("Pressed key: %s globally on the page.", key_value)
+
 @xai_component
 class PlaywrightPressKey(Component):
     """
@@ -290,8 +1069,8 @@ class PlaywrightPressKey(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value if self.locator.value is not None else None
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
         key_value = self.key.value
 
         if not page_obj:
@@ -299,17 +1078,347 @@ class PlaywrightPressKey(Component):
         if not key_value:
             raise ValueError("'key' must be provided.")
 
-        def press_action(p):
-            if locator_obj:
-                locator_obj.press(key_value)
-                print(f"Pressed key: {key_value} on the identified element.")
-            else:
-                p.keyboard.press(key_value)
-                print(f"Pressed key: {key_value} globally on the page.")
+        _dispatch(ctx, _do_press, page_obj, locator_obj, key_value)
+        self.out_page.value = page_obj
+
+async def _do_type(p, text_value, delay_value):
+    await p.keyboard.type(text_value, delay=delay_value)
+    logger.debug("Typed text on the page with delay %sms. Text: %s", delay_value, text_value)
+
+@xai_component
+class PlaywrightTypeString(Component):
+    """
+    Types a string into the focused element of the page in a single worker call, sending a key press per character.
+    Use it instead of chaining one PressKey component per character.
+
+    inPorts:
+    - page: The Playwright page instance.
+    - text: The text to type.
+    - delay: The delay in milliseconds between key presses (optional, default: 0).
+
+    outPorts:
+    - page: The updated Playwright page instance.
+    """
+    page: InArg[Page]
+    text: InArg[str]
+    delay: InArg[int]
+    out_page: OutArg[Page]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        page_obj = _get_or(self.page, ctx.get("page"))
+        text_value = self.text.value
+        delay_value = _get_or(self.delay, 0)
+
+        if not page_obj:
+            raise ValueError("Missing Playwright page instance.")
+        if not text_value:
+            raise ValueError("'text' must be provided.")
+
+        _dispatch(ctx, _do_type, page_obj, text_value, delay_value)
+        self.out_page.value = page_obj
+
+def _query_ports(component, ctx):
+    """Returns the (selector, role, name, label) lookup of a *BySelector component, with the selector's placeholders filled."""
+    selector = _get_or(component.selector, "")
+    role = _get_or(component.role, "")
+    label = _get_or(component.label, "")
+    if not selector and not role and not label:
+        raise ValueError("Must provide at least one locator method (selector, role, or label).")
+    if selector:
+        selector = _format_selector(selector, ctx)
+    return (selector, role, _get_or(component.name, ""), label)
+
+async def _do_click_by(p, ctx, query, double_click_value):
+    target = _cached_locate(p, ctx, *query)
+    if double_click_value:
+        await target.dblclick()
+        logger.debug("Double clicked on element.")
+    else:
+        await target.click()
+        logger.debug("Clicked on element.")
+
+@xai_component
+class PlaywrightClickBySelector(Component):
+    """
+    Locates an element by CSS selector, role or label and clicks it in a single worker call.
+    Use it instead of IdentifyElement followed by ClickElement when the locator is not needed afterwards.
+
+    inPorts:
+    - page: The Playwright page instance.
+    - selector: (Optional) The CSS selector for the element. Supports {placeholders} filled from the context.
+    - role: (Optional) The ARIA role of the element (e.g., "button"), used when no selector is given.
+    - name: (Optional) The accessible name to match together with role.
+    - label: (Optional) The label text of the element, used when neither selector nor role is given.
+    - double_click: Boolean indicating if a double-click should be performed (default: False).
+
+    outPorts:
+    - page: The updated Playwright page instance.
+    """
+    page: InArg[Page]
+    selector: InArg[str]
+    role: InArg[str]
+    name: InArg[str]
+    label: InArg[str]
+    double_click: InArg[bool]
+    out_page: OutArg[Page]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        page_obj = _get_or(self.page, ctx.get("page"))
+        double_click_value = _get_or(self.double_click, False)
+
+        if not page_obj:
+            raise ValueError("Missing Playwright page instance.")
+        query = _query_ports(self, ctx)
+
+        _dispatch(ctx, _do_click_by, page_obj, ctx, query, double_click_value)
+        self.out_page.value = page_obj
+
+async def _do_fill_by(p, ctx, query, text_value, sequential_value, delay_value):
+    target = _cached_locate(p, ctx, *query)
+    if sequential_value:
+        await target.press_sequentially(text_value, delay=delay_value)
+        logger.debug("Typed text sequentially with delay %sms on the element. Text: %s", delay_value, text_value)
+    else:
+        await target.fill(text_value)
+        logger.debug("Filled element with text: %s", text_value)
+
+@xai_component
+class PlaywrightFillBySelector(Component):
+    """
+    Locates an element by CSS selector, role or label and fills it with text in a single worker call.
+    Use it instead of IdentifyElement followed by FillInput when the locator is not needed afterwards.
+
+    inPorts:
+    - page: The Playwright page instance.
+    - selector: (Optional) The CSS selector for the element. Supports {placeholders} filled from the context.
+    - role: (Optional) The ARIA role of the element (e.g., "textbox"), used when no selector is given.
+    - name: (Optional) The accessible name to match together with role.
+    - label: (Optional) The label text of the element, used when neither selector nor role is given.
+    - text: The text to fill in.
+    - sequential: Boolean input; if True, uses press_sequentially (optional, default: False).
+    - delay: The delay in milliseconds between key presses when using sequential typing (optional, default: 0).
+
+    outPorts:
+    - page: The updated Playwright page instance.
+    """
+    page: InArg[Page]
+    selector: InArg[str]
+    role: InArg[str]
+    name: InArg[str]
+    label: InArg[str]
+    text: InArg[str]
+    sequential: InArg[bool]
+    delay: InArg[int]
+    out_page: OutArg[Page]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        page_obj = _get_or(self.page, ctx.get("page"))
+        text_value = self.text.value
+        sequential_value = _get_or(self.sequential, False)
+        delay_value = _get_or(self.delay, 0)
+
+        if not page_obj:
+            raise ValueError("Missing Playwright page instance.")
+        query = _query_ports(self, ctx)
+
+        _dispatch(ctx, _do_fill_by, page_obj, ctx, query, text_value, sequential_value, delay_value)
+        self.out_page.value = page_obj
+
+async def _do_press_by(p, ctx, query, key_value):
+    await _cached_locate(p, ctx, *query).press(key_value)
+    logger.debug("Pressed key: %s on the element.", key_value)
+
+@xai_component
+class PlaywrightPressKeyBySelector(Component):
+    """
+    Locates an element by CSS selector, role or label and presses a key on it in a single worker call.
+    Use it instead of IdentifyElement followed by PressKey when the locator is not needed afterwards.
+
+    inPorts:
+    - page: The Playwright page instance.
+    - selector: (Optional) The CSS selector for the element. Supports {placeholders} filled from the context.
+    - role: (Optional) The ARIA role of the element (e.g., "textbox"), used when no selector is given.
+    - name: (Optional) The accessible name to match together with role.
+    - label: (Optional) The label text of the element, used when neither selector nor role is given.
+    - key: The key to press (e.g., "Enter", "Tab").
+
+    outPorts:
+    - page: The updated Playwright page instance.
+    """
+    page: InArg[Page]
+    selector: InArg[str]
+    role: InArg[str]
+    name: InArg[str]
+    label: InArg[str]
+    key: InArg[str]
+    out_page: OutArg[Page]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        page_obj = _get_or(self.page, ctx.get("page"))
+        key_value = self.key.value
+
+        if not page_obj:
+            raise ValueError("Missing Playwright page instance.")
+        if not key_value:
+            raise ValueError("'key' must be provided.")
+        query = _query_ports(self, ctx)
+
+        _dispatch(ctx, _do_press_by, page_obj, ctx, query, key_value)
+        self.out_page.value = page_obj
+
+async def _do_hover_by(p, ctx, query):
+    await _cached_locate(p, ctx, *query).hover()
+    logger.debug("Hovered over the element.")
+
+@xai_component
+class PlaywrightHoverBySelector(Component):
+    """
+    Locates an element by CSS selector, role or label and hovers over it in a single worker call.
+    Use it instead of IdentifyElement followed by HoverElement when the locator is not needed afterwards.
+
+    inPorts:
+    - page: The Playwright page instance.
+    - selector: (Optional) The CSS selector for the element. Supports {placeholders} filled from the context.
+    - role: (Optional) The ARIA role of the element (e.g., "link"), used when no selector is given.
+    - name: (Optional) The accessible name to match together with role.
+    - label: (Optional) The label text of the element, used when neither selector nor role is given.
 
-        global_worker.run(press_action, page_obj)
+    outPorts:
+    - page: The updated Playwright page instance.
+    """
+    page: InArg[Page]
+    selector: InArg[str]
+    role: InArg[str]
+    name: InArg[str]
+    label: InArg[str]
+    out_page: OutArg[Page]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        page_obj = _get_or(self.page, ctx.get("page"))
+
+        if not page_obj:
+            raise ValueError("Missing Playwright page instance.")
+        query = _query_ports(self, ctx)
+
+        _dispatch(ctx, _do_hover_by, page_obj, ctx, query)
         self.out_page.value = page_obj
 
+@xai_component
+class PlaywrightChain(Component):
+    """
+    Runs a sequence of interaction steps in a single worker call, instead of one call per
+    IdentifyElement / ClickElement / FillInput / PressKey component.
+
+    inPorts:
+    - page: The Playwright page instance.
+    - steps: A list of step dictionaries executed in order. Each step has an "action"
+             ("click", "dblclick", "fill", "press", "hover" or "focus"), an optional locator
+             ("selector", "role" with optional "name", or "label") and the action argument
+             ("text" for fill, "key" for press).
+             A step without a locator acts on the element located by the previous step;
+             a "press" step with no element presses the key globally on the page.
+             e.g. [{"action": "click", "role": "button", "name": "Search"},
+                   {"action": "fill", "role": "textbox", "name": "Search News", "text": "Tokyo"},
+                   {"action": "press", "key": "Enter"}]
+    - idle_timeout: (Optional) Maximum time in milliseconds to wait for the network to become idle
+                    after the last step (default: 1500). Set to 0 to skip the wait.
+
+    outPorts:
+    - out_page: The updated Playwright page instance.
+    - locator: The locator used by the last step.
+    """
+    page: InArg[Page]
+    steps: InArg[list]
+    idle_timeout: InArg[int]
+    out_page: OutArg[Page]
+    locator: OutArg[any]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        page_obj = _get_or(self.page, ctx.get("page"))
+        steps_value = _get_or(self.steps, [])
+        idle_timeout_value = _get_or(self.idle_timeout, 1500)
+
+        if not page_obj:
+            raise ValueError("Missing Playwright page instance.")
+
+        async def chain_action(p):
+            locator_obj = None
+            for step in steps_value:
+                action = step.get("action", "")
+                if step.get("selector"):
+                    locator_obj = _locate(p, _format_selector(step["selector"], ctx))
+                elif step.get("role") or step.get("label"):
+                    locator_obj = _locate(p, "", step.get("role", ""), step.get("name", ""), step.get("label", ""))
+
+                if action == "press" and locator_obj is None:
+                    await p.keyboard.press(step["key"])
+                elif locator_obj is None:
+                    raise ValueError(f"Step '{action}' requires a locator.")
+                elif action == "click":
+                    await locator_obj.click()
+                elif action == "dblclick":
+                    await locator_obj.dblclick()
+                elif action == "fill":
+                    await locator_obj.fill(step.get("text", ""))
+                elif action == "press":
+                    await locator_obj.press(step["key"])
+                elif action == "hover":
+                    await locator_obj.hover()
+                elif action == "focus":
+                    await locator_obj.focus()
+                else:
+                    raise ValueError(f"Unknown chain action: {action}")
+                logger.debug("Chain step performed: %s", action)
+
+            if idle_timeout_value:
+                try:
+                    await p.wait_for_load_state("networkidle", timeout=idle_timeout_value)
+                except PlaywrightTimeoutError:
+                    logger.warning("Network still busy after %s ms, continuing.", idle_timeout_value)
+            return locator_obj
+
+        self.locator.value = _run(ctx, chain_action, page_obj)
+        self.out_page.value = page_obj
+
+@xai_component(type='branch')
+class PlaywrightBatch(Component):
+    """
+    Runs the body branch and sends its browser actions to the worker in a single call.
+    Click, fill, press-key, type, hover, check, focus and scrolling components inside the body are
+    queued instead of being executed one at a time. Any other component that uses the browser first
+    sends the actions queued before it, so it sees their effects.
+
+    ##### Branches:
+    - body: The components whose actions are batched.
+    """
+    body: BaseComponent
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        if ctx.get("_pw_batch") is not None:
+            raise ValueError("PlaywrightBatch cannot be nested.")
+
+        ctx["_pw_batch"] = []
+        try:
+            SubGraphExecutor(self.body).do(ctx)
+            calls = ctx["_pw_batch"]
+        finally:
+            ctx.pop("_pw_batch", None)
+
+        if calls:
+            global_worker.run_batch(calls)
+        logger.debug("Batched %s Playwright actions in one worker call.", len(calls))
+
+async def _do_hover(p, locator_obj):
+    await locator_obj.hover()
+    logger.debug("Hovered over the identified element.")
+
 @xai_component
 class PlaywrightHoverElement(Component):
     """
@@ -328,19 +1437,28 @@ class PlaywrightHoverElement(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
 
         if not page_obj or not locator_obj:
             raise ValueError("Missing page instance or locator.")
 
-        def hover_action(p):
-            locator_obj.hover()
-            print("Hovered over the identified element.")
-
-        global_worker.run(hover_action, page_obj)
+        _dispatch(ctx, _do_hover, page_obj, locator_obj)
         self.out_page.value = page_obj
 
+async def _do_check(p, locator_obj, to_be_checked_value):
+    if not to_be_checked_value:
+        await locator_obj.check()
+        logger.debug("Performed check action on the element.")
+    else:
+        logger.debug("Skipped check action because 'to_be_checked' is True.")
+    try:
+        # Polls the state and returns as soon as the element is checked.
+        await expect(locator_obj).to_be_checked(timeout=2000)
+    except AssertionError:
+        raise ValueError("Assertion failed: Element is not checked!")
+    logger.debug("Assertion passed: Element is checked.")
+
 @xai_component
 class PlaywrightCheckElement(Component):
     """
@@ -364,27 +1482,32 @@ class PlaywrightCheckElement(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value
-        to_be_checked_value = self.to_be_checked.value if self.to_be_checked.value is not None else False
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
+        to_be_checked_value = _get_or(self.to_be_checked, False)
 
         if not page_obj or not locator_obj:
             raise ValueError("Missing page instance or locator.")
 
-        def check_and_assert(p):
-            if not to_be_checked_value:
-                locator_obj.check()
-                print("Performed check action on the element.")
-            else:
-                print("ℹ️ Skipped check action because 'to_be_checked' is True.")
-            p.wait_for_timeout(500)
-            if not locator_obj.is_checked():
-                raise ValueError("Assertion failed: Element is not checked!")
-            print("Assertion passed: Element is checked.")
-
-        global_worker.run(check_and_assert, page_obj)
+        _dispatch(ctx, _do_check, page_obj, locator_obj, to_be_checked_value)
         self.out_page.value = page_obj
 
+_SELECT_OPTION_KEYS = ("label", "value", "index")
+
+@functools.lru_cache(maxsize=64)
+def _translate_options(options, by):
+    """
+    Returns the select_option() keyword arguments selecting all options at once as (keyword, values) pairs,
+    e.g. (("label", ("Red", "Blue")),). The result is shared between calls, so it is kept immutable.
+    """
+    if by not in _SELECT_OPTION_KEYS:
+        raise ValueError(f"'by' must be one of {', '.join(_SELECT_OPTION_KEYS)}, got: {by}")
+    return ((by, tuple(options)),)
+
+async def _do_select(p, locator_obj, select_kwargs):
+    await locator_obj.select_option(**select_kwargs)
+    logger.debug("Selected options: %s on the identified element.", select_kwargs)
+
 @xai_component
 class PlaywrightSelectOptions(Component):
     """
@@ -393,10 +1516,9 @@ class PlaywrightSelectOptions(Component):
     inPorts:
     - page: The Playwright page instance.
     - locator: The locator for the <select> element (obtained from IdentifyElement).
-    - options: A list of options to select. (Pass a list even if selecting one option.)
-    - by: (Optional) A string indicating the key to use when converting each option.
-          For example, "label", "value", or "index". If provided, each option in the list
-          will be converted to a dictionary: {by: option}.
+    - options: A list of options to select. A single option may also be passed on its own.
+    - by: (Optional) What the options match: "label", "value", or "index".
+          If not provided, each option matches either an option's value or its label.
 
     outPorts:
     - page: The updated Playwright page instance.
@@ -409,26 +1531,50 @@ class PlaywrightSelectOptions(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value
-        options_value = self.options.value 
-        by_value = self.by.value if self.by.value is not None else ""
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
+        options_value = _get_or(self.options, ())
+        if isinstance(options_value, (str, dict)):
+            # A single option, not a sequence of them.
+            options_value = (options_value,)
+        options_value = tuple(options_value)
+        by_value = _get_or(self.by, "")
 
         if not page_obj or not locator_obj:
             raise ValueError("Missing page instance or locator.")
 
-        def select_action(p):
-            if by_value:
-                option_list = [{by_value: opt} for opt in options_value]
-            else:
-                option_list = options_value
-
-            locator_obj.select_option(option_list)
-            print(f"Selected options: {option_list} on the identified element.")
+        if by_value:
+            try:
+                select_kwargs = dict(_translate_options(options_value, by_value))
+            except TypeError:
+                # Unhashable options cannot be cached.
+                select_kwargs = dict(_translate_options.__wrapped__(options_value, by_value))
+        else:
+            select_kwargs = {"value": options_value}
 
-        global_worker.run(select_action, page_obj)
+        _run(ctx, _do_select, page_obj, locator_obj, select_kwargs)
         self.out_page.value = page_obj
 
+@functools.lru_cache(maxsize=64)
+def _guess_mime_type(name):
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+def _file_payloads(buffers):
+    """Turns {"name", "bytes" (or "buffer"), optional "mimeType"} dicts into set_input_files() payloads."""
+    payloads = []
+    for entry in buffers:
+        try:
+            name = entry["name"]
+            data = entry["bytes"] if "bytes" in entry else entry["buffer"]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid buffer entry: {entry!r}. Expected a dict with 'name' and 'bytes'.")
+        payloads.append({"name": name, "mimeType": entry.get("mimeType") or _guess_mime_type(name), "buffer": data})
+    return payloads
+
+async def _do_upload(p, locator_obj, files_list):
+    await locator_obj.set_input_files(files_list)
+    logger.debug("Uploaded files: %s", [f["name"] if isinstance(f, dict) else f for f in files_list])
+
 @xai_component
 class PlaywrightUploadFiles(Component):
     """
@@ -437,7 +1583,9 @@ class PlaywrightUploadFiles(Component):
     inPorts:
     - page: The Playwright page instance.
     - locator: The locator for the file input element (obtained from IdentifyElement).
-    - files: A list of file paths to upload.
+    - files: A list (or tuple) of file paths to upload, sent in a single call.
+    - buffers: (Optional) Files already in memory, uploaded instead of files without reading the disk.
+               A list of dicts with "name", "bytes" and an optional "mimeType" (guessed from the name if omitted).
 
     outPorts:
     - page: The updated Playwright page instance.
@@ -445,24 +1593,27 @@ class PlaywrightUploadFiles(Component):
     page: InArg[Page]
     locator: InArg[any]
     files: InArg[list]
+    buffers: InArg[list]
     out_page: OutArg[Page]
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
         files_list = self.files.value
+        if self.buffers.value:
+            files_list = _file_payloads(self.buffers.value)
 
         if not page_obj or not locator_obj:
             raise ValueError("Missing page instance or locator.")
 
-        def upload_action(p):
-            locator_obj.set_input_files(files_list)
-            print(f"Uploaded files: {files_list}")
-
-        global_worker.run(upload_action, page_obj)
+        _run(ctx, _do_upload, page_obj, locator_obj, files_list)
         self.out_page.value = page_obj
 
+async def _do_focus(p, locator_obj):
+    await locator_obj.focus()
+    logger.debug("Focused on the identified element.")
+
 @xai_component
 class PlaywrightFocusElement(Component):
     """
@@ -481,19 +1632,53 @@ class PlaywrightFocusElement(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
 
         if not page_obj or not locator_obj:
             raise ValueError("Missing page instance or locator.")
 
-        def focus_action(p):
-            locator_obj.focus()
-            print("Focused on the identified element.")
-
-        global_worker.run(focus_action, page_obj)
+        _dispatch(ctx, _do_focus, page_obj, locator_obj)
         self.out_page.value = page_obj
 
+# The offsets are passed as an argument, so the script text never changes and the browser can reuse its compiled function.
+_SCROLL_ELEMENT_JS = "(e, o) => { e.scrollTop += o.y; e.scrollLeft += o.x; }"
+_SCROLL_PAGE_JS = "(o) => window.scrollBy(o.x, o.y)"
+
+# Element each page was last wheel-scrolled over, as (weak reference, call count at that scroll).
+_WHEEL_TARGETS = weakref.WeakKeyDictionary()
+
+async def _do_scroll(p, locator_obj, method_value, x_value, y_value):
+    offsets = {"x": x_value, "y": y_value}
+    if method_value == "scroll_into_view":
+        if locator_obj:
+            await locator_obj.scroll_into_view_if_needed()
+            logger.debug("Scrolled element into view using scroll_into_view_if_needed().")
+        else:
+            raise ValueError("'scroll_into_view' method requires a locator.")
+    elif method_value == "mouse_wheel":
+        if locator_obj:
+            # Repeated wheel scrolls over the same element skip the hover while nothing else ran on the page in between.
+            call_count = global_worker.call_count(p)
+            last = _WHEEL_TARGETS.get(p)
+            if last is None or last[0]() is not locator_obj or last[1] != call_count - 1:
+                await locator_obj.hover()
+            _WHEEL_TARGETS[p] = (weakref.ref(locator_obj), call_count)
+        await p.mouse.wheel(x_value, y_value)
+        logger.debug("Scrolled using mouse wheel by offsets x: %s, y: %s.", x_value, y_value)
+    elif method_value == "evaluate":
+        if locator_obj:
+            await locator_obj.evaluate(_SCROLL_ELEMENT_JS, offsets)
+            logger.debug("Scrolled element using evaluate() with offsets x: %s, y: %s.", x_value, y_value)
+        else:
+            await p.evaluate(_SCROLL_PAGE_JS, offsets)
+            logger.debug("Scrolled page using evaluate() with offsets x: %s, y: %s.", x_value, y_value)
+    elif method_value == "page_evaluate":
+        await p.evaluate(_SCROLL_PAGE_JS, offsets)
+        logger.debug("Scrolled page using page_evaluate with offsets x: %s, y: %s.", x_value, y_value)
+    else:
+        raise ValueError(f"Unknown scrolling method: {method_value}")
+
 @xai_component
 class PlaywrightScrolling(Component):
     """
@@ -504,7 +1689,8 @@ class PlaywrightScrolling(Component):
     - locator: (Optional) The locator for a specific element (obtained from IdentifyElement).
     - method: (Optional) The scrolling method to use. Options:
               "scroll_into_view" - scroll the element into view using scroll_into_view_if_needed().
-              "mouse_wheel"     - scroll using the mouse wheel with given offsets.
+              "mouse_wheel"     - scroll using the mouse wheel with given offsets, over the element if one is given.
+                                  Consecutive wheel scrolls over the same element only move the mouse onto it once.
               "evaluate"        - scroll the element using evaluate() (if locator provided) or the page if not.
               "page_evaluate"   - scroll the entire page using page.evaluate("window.scrollBy(x, y)").
               Defaults to "evaluate" if not provided.
@@ -523,44 +1709,22 @@ class PlaywrightScrolling(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value
-        method_value = self.method.value.lower() if self.method.value is not None else "evaluate"
-        x_value = self.x.value if self.x.value is not None else 0
-        y_value = self.y.value if self.y.value is not None else 0
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
+        method_value = _get_or(self.method, "evaluate").lower()
+        x_value = _get_or(self.x, 0)
+        y_value = _get_or(self.y, 0)
 
         if not page_obj:
             raise ValueError("Missing Playwright page instance.")
 
-        def scroll_action(p):
-            if method_value == "scroll_into_view":
-                if locator_obj:
-                    locator_obj.scroll_into_view_if_needed()
-                    print("Scrolled element into view using scroll_into_view_if_needed().")
-                else:
-                    raise ValueError("'scroll_into_view' method requires a locator.")
-            elif method_value == "mouse_wheel":
-                if locator_obj:
-                    locator_obj.hover()
-                p.mouse.wheel(x_value, y_value)
-                print(f"Scrolled using mouse wheel by offsets x: {x_value}, y: {y_value}.")
-            elif method_value == "evaluate":
-                if locator_obj:
-                    script = f"e => {{ e.scrollTop += {y_value}; e.scrollLeft += {x_value}; }}"
-                    locator_obj.evaluate(script)
-                    print(f"Scrolled element using evaluate() with offsets x: {x_value}, y: {y_value}.")
-                else:
-                    p.evaluate(f"window.scrollBy({x_value}, {y_value})")
-                    print(f"Scrolled page using evaluate() with offsets x: {x_value}, y: {y_value}.")
-            elif method_value == "page_evaluate":
-                p.evaluate(f"window.scrollBy({x_value}, {y_value})")
-                print(f"Scrolled page using page_evaluate with offsets x: {x_value}, y: {y_value}.")
-            else:
-                raise ValueError(f"Unknown scrolling method: {method_value}")
-
-        global_worker.run(scroll_action, page_obj)
+        _dispatch(ctx, _do_scroll, page_obj, locator_obj, method_value, x_value, y_value)
         self.out_page.value = page_obj
 
+async def _do_drag(p, source_locator, target_locator):
+    await source_locator.drag_to(target_locator)
+    logger.debug("Drag and drop action performed using drag_to().")
+
 @xai_component
 class PlaywrightDragAndDrop(Component):
     """
@@ -581,30 +1745,44 @@ class PlaywrightDragAndDrop(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        source_locator = self.source.value
-        target_locator = self.target.value
+        page_obj = _get_or(self.page, ctx.get("page"))
+        source_locator = _resolve_locator(self.source.value)
+        target_locator = _resolve_locator(self.target.value)
 
         if not page_obj or not source_locator or not target_locator:
             raise ValueError("Missing page instance or source/target locator.")
 
-        def drag_action(p):
-            source_locator.drag_to(target_locator)
-            print("Drag and drop action performed using drag_to().")
-
-        global_worker.run(drag_action, page_obj)
+        _run(ctx, _do_drag, page_obj, source_locator, target_locator)
         self.out_page.value = page_obj
 
+def _write_file(path, data):
+    # Unbuffered: the image is already a single bytes object.
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+async def _do_screenshot(p, locator_obj, full_page_value, image_options):
+    if locator_obj:
+        return await locator_obj.screenshot(**image_options)
+    return await p.screenshot(full_page=full_page_value, **image_options)
+
 @xai_component
 class PlaywrightTakeScreenshot(Component):
     """
     Captures a screenshot of a specified element or the entire page if no element is specified.
+    The file is only rewritten when the image differs from the last one saved to the same path.
 
     inPorts:
     - page: The Playwright page instance.
     - file_path: The file path where the screenshot will be saved.
     - full_page: (Optional) Boolean to capture a full-page screenshot when no locator is provided (default: False).
     - locator: (Optional) The locator for the element to capture. If provided, the screenshot will be taken of this element.
+    - image_type: (Optional) "png" or "jpeg" (default: "png"). JPEG files are much smaller for page screenshots.
+    - quality: (Optional) JPEG quality from 0 to 100; only used when image_type is "jpeg".
 
     outPorts:
     - page: The updated Playwright page instance.
@@ -614,34 +1792,54 @@ class PlaywrightTakeScreenshot(Component):
     locator: InArg[any]
     file_path: InArg[str]
     full_page: InArg[bool]
+    image_type: InArg[str]
+    quality: InArg[int]
     out_page: OutArg[Page]
     out_path: OutArg[str]
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
+        page_obj = _get_or(self.page, ctx.get("page"))
         file_path_value = self.file_path.value
-        full_page_value = self.full_page.value if self.full_page.value is not None else False
-        locator_obj = self.locator.value
+        full_page_value = _get_or(self.full_page, False)
+        locator_obj = _resolve_locator(self.locator.value)
 
         if not page_obj:
             raise ValueError("No valid Playwright page instance provided.")
         if not file_path_value:
             raise ValueError("'file_path' must be provided to save the screenshot.")
 
-        def screenshot_action(p):
+        image_type_value = _get_or(self.image_type, "png").lower()
+        if image_type_value not in ("png", "jpeg"):
+            raise ValueError(f"'image_type' must be 'png' or 'jpeg', got: {image_type_value}")
+        image_options = {"type": image_type_value}
+        if image_type_value == "jpeg" and self.quality.value is not None:
+            image_options["quality"] = self.quality.value
+
+        last_hashes = ctx.setdefault("_screenshot_hash", {})
+
+        data = _run(ctx, _do_screenshot, page_obj, locator_obj, full_page_value, image_options)
+
+        digest = hashlib.sha256(data).digest()
+        if last_hashes.get(file_path_value) == digest and os.path.exists(file_path_value):
+            logger.debug("Screenshot unchanged, kept existing file: %s", file_path_value)
+        else:
+            # Written before out_path is set, so the next component finds the whole file.
+            _write_file(file_path_value, data)
+            last_hashes[file_path_value] = digest
             if locator_obj:
-                locator_obj.screenshot(path=file_path_value)
-                print(f"Screenshot of the element captured and saved to: {file_path_value}")
+                logger.info("Screenshot of the element captured and saved to: %s", file_path_value)
             else:
-                p.screenshot(path=file_path_value, full_page=full_page_value)
-                print(f"Screenshot of the page captured and saved to: {file_path_value} | full_page: {full_page_value}")
+                logger.info("Screenshot of the page captured and saved to: %s | full_page: %s", file_path_value, full_page_value)
 
-        global_worker.run(screenshot_action, page_obj)
         self.out_page.value = page_obj
         self.out_path.value = file_path_value
 
 
+async def _do_wait(p, locator_obj, timeout_value):
+    await locator_obj.wait_for(state="visible", timeout=timeout_value)
+    logger.debug("Element is now visible (waited up to %s ms).", timeout_value)
+
 @xai_component
 class PlaywrightWaitForElement(Component):
     """
@@ -662,70 +1860,172 @@ class PlaywrightWaitForElement(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        locator_obj = self.locator.value
-        timeout_value = self.timeout.value if self.timeout.value is not None else 30000
+        page_obj = _get_or(self.page, ctx.get("page"))
+        locator_obj = _resolve_locator(self.locator.value)
+        timeout_value = _get_or(self.timeout, 30000)
 
         if not page_obj or not locator_obj:
             raise ValueError("Missing page instance or locator.")
 
-        def wait_action(p):
-            locator_obj.wait_for(state="visible", timeout=timeout_value)
-            print(f"Element is now visible (waited up to {timeout_value} ms).")
-
-        global_worker.run(wait_action, page_obj)
+        _run(ctx, _do_wait, page_obj, locator_obj, timeout_value)
         self.out_page.value = page_obj
 
+@xai_component
+class PlaywrightFreeLocator(Component):
+    """
+    Frees a locator handle created by PlaywrightIdentifyElement with as_handle, so the worker
+    no longer keeps the locator. Locator objects and unknown handles are ignored.
+
+    inPorts:
+    - locator: The locator handle to free.
+    """
+    locator: InArg[any]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        locator_id = self.locator.value
+        if isinstance(locator_id, int) and not isinstance(locator_id, bool) and global_worker is not None:
+            global_worker.free_locator(locator_id)
+            logger.debug("Freed locator handle %s.", locator_id)
+
+async def _do_close(p, browser_obj, keep_browser_value):
+    if not browser_obj.is_connected():
+        _DEFAULT_CONTEXT.pop(browser_obj, None)
+        logger.info("Browser already closed.")
+        return
+    context = p.context
+    if _DEFAULT_CONTEXT.get(browser_obj) is context:
+        if keep_browser_value:
+            await p.close()
+            logger.info("Page closed; shared browser context kept for reuse.")
+            return
+        del _DEFAULT_CONTEXT[browser_obj]
+    if global_worker.is_pooled(context):
+        if keep_browser_value:
+            await global_worker.release_context(context)
+            logger.info("Browser context returned to the pool for reuse.")
+            return
+        global_worker.discard_context(context)
+    await context.close()
+    if browser_obj.contexts:
+        logger.info("Browser context closed; browser kept open for its other contexts.")
+        return
+    if keep_browser_value and global_worker.owns_browser(browser_obj):
+        logger.info("Browser context closed; browser kept running for reuse.")
+        return
+    await browser_obj.close()
+    logger.info("Browser closed.")
+
 @xai_component
 class PlaywrightCloseBrowser(Component):
     """
-    Closes the Playwright browser.
+    Closes the Playwright browser context of the page, then the browser once no other context uses it.
+    With keep_browser, a browser launched by PlaywrightOpenBrowser is kept running instead, so the next
+    flow in the same process reuses it rather than launching a new one; it is closed when the process exits.
+    Closing an already closed browser is a no-op, so it is safe to run this more than once.
+    With keep_browser, a page opened in the browser's shared context (reuse_context) is closed on its own
+    and the shared context is kept, and a pooled context (pool_context) is returned to the worker's
+    context pool.
 
     ##### inPorts:
     - page: The Playwright page instance.
     - browser: (Optional) The Playwright browser instance.
       If not provided, it will be retrieved from the context.
+    - keep_browser: (Optional) Keep the shared browser and its shared context running for reuse by later flows
+      (default: False).
 
     outPorts:
     - (None): This component closes the browser.
     """
     page: InArg[Page]
     browser: InArg[any]
+    keep_browser: InArg[bool]
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
-        browser_obj = self.browser.value if self.browser.value is not None else ctx.get("browser")
+        page_obj = _get_or(self.page, ctx.get("page"))
+        browser_obj = _get_or(self.browser, ctx.get("browser"))
+
+        keep_browser_value = _get_or(self.keep_browser, False)
 
         if not page_obj or not browser_obj:
             raise ValueError("Missing page instance or browser.")
 
-        def close_action(p):
-            browser_obj.close()
-            print("Browser closed.")
-
-        global_worker.run(close_action, page_obj)
+        _run(ctx, _do_close, page_obj, browser_obj, keep_browser_value)
+        ctx.pop("context", None)
+        ctx.get("_locator_cache", {}).pop(page_obj, None)
+        global_worker.free_page_locators(page_obj)
 
 @xai_component
 class PlaywrightWaitForTime(Component):
     """
     Waits for a specified amount of time before proceeding.
+    If a selector or load state is given, the wait ends as soon as that condition is met,
+    using the time as the upper bound.
+    With queue_wait, the wait is queued on the Playwright worker instead and this component returns
+    immediately: the next Playwright action on the page starts once the wait is over, but other steps
+    (file IO, HTTP calls) do not wait.
 
     inPorts:
-    - time_in_seconds: The number of seconds to wait.
+    - time_in_seconds: The number of seconds to wait (default: 5).
+    - page: (Optional) The Playwright page instance. Retrieved from the context if not provided.
+    - selector: (Optional) Stop waiting once this selector is visible on the page.
+    - load_state: (Optional) Stop waiting once the page reaches this load state
+                  ("load", "domcontentloaded" or "networkidle").
+    - queue_wait: (Optional) Delay only the next Playwright action on the page instead of blocking
+                  the flow (default: False). Ignored when a selector or load state is given.
 
     outPorts:
     - (None): This component simply introduces a delay.
     """
     time_in_seconds: InArg[int]
+    page: InArg[Page]
+    selector: InArg[str]
+    load_state: InArg[str]
+    queue_wait: InArg[bool]
 
     def execute(self, ctx) -> None:
-        import time
+        global global_worker
+        wait_time = _get_or(self.time_in_seconds, 5)
+        selector_value = _get_or(self.selector, "")
+        load_state_value = _get_or(self.load_state, "")
+
+        page_obj = _get_or(self.page, ctx.get("page"))
+
+        if selector_value:
+            selector_value = _format_selector(selector_value, ctx)
+
+        if not selector_value and not load_state_value:
+            if _get_or(self.queue_wait, False) and page_obj and global_worker is not None:
+                async def wait_action(p):
+                    await p.wait_for_timeout(wait_time * 1000)
+                    logger.debug("Done waiting.")
+
+                _dispatch(ctx, wait_action, page_obj, wait=False)
+                logger.debug("Queued a %s second wait before the next Playwright action.", wait_time)
+            else:
+                # Inside a PlaywrightBatch body, the actions queued before the wait are sent first.
+                _flush_batch(ctx)
+                logger.debug("Waiting for %s seconds...", wait_time)
+                time.sleep(wait_time)
+                logger.debug("Done waiting.")
+            return
+
+        if not page_obj:
+            raise ValueError("A Playwright page instance is required to wait for a selector or load state.")
+
+        async def wait_condition(p):
+            try:
+                if selector_value:
+                    await p.wait_for_selector(selector_value, timeout=wait_time * 1000)
+                    logger.debug("Selector '%s' appeared, done waiting.", selector_value)
+                else:
+                    await p.wait_for_load_state(load_state_value, timeout=wait_time * 1000)
+                    logger.debug("Page reached load state '%s', done waiting.", load_state_value)
+            except PlaywrightTimeoutError:
+                logger.warning("Condition not met after %s seconds, continuing.", wait_time)
 
-        wait_time = self.time_in_seconds.value if self.time_in_seconds.value is not None else 5
-        print(f"Waiting for {wait_time} seconds...")
-        time.sleep(wait_time)
-        print("Done waiting.")
+        _run(ctx, wait_condition, page_obj)
 
 @xai_component
 class PlaywrightWaitForSelector(Component):
@@ -750,16 +2050,16 @@ class PlaywrightWaitForSelector(Component):
 
         page_obj = self.page.value
         selector_value = self.selector.value
-        timeout_value = self.timeout.value if self.timeout.value is not None else 30000
+        timeout_value = _get_or(self.timeout, 30000)
 
         if not page_obj or not selector_value:
             raise ValueError("Page instance and selector must be provided.")
 
-        def wait_selector(p):
-            p.wait_for_selector(selector_value, timeout=timeout_value)
-            print(f"Selector '{selector_value}' appeared within {timeout_value} ms.")
+        async def wait_selector(p):
+            await p.wait_for_selector(selector_value, timeout=timeout_value)
+            logger.debug("Selector '%s' appeared within %s ms.", selector_value, timeout_value)
 
-        global_worker.run(wait_selector, page_obj)
+        _run(ctx, wait_selector, page_obj)
 
         self.out_page.value = page_obj
 
@@ -781,7 +2081,7 @@ class PlaywrightNavigateToURL(Component):
 
     def execute(self, ctx) -> None:
         global global_worker
-        page_obj = self.page.value if self.page.value is not None else ctx.get("page")
+        page_obj = _get_or(self.page, ctx.get("page"))
         url_value = self.url.value
 
         if not page_obj:
@@ -789,13 +2089,124 @@ class PlaywrightNavigateToURL(Component):
         if not url_value:
             raise ValueError("URL must be provided.")
 
-        def navigate_action(p):
-            p.goto(url_value)
-            print(f"Navigated to URL: {url_value}")
+        async def navigate_action(p):
+            await p.goto(url_value)
+            logger.info("Navigated to URL: %s", url_value)
 
-        global_worker.run(navigate_action, page_obj)
+        _run(ctx, navigate_action, page_obj)
         self.out_page.value = page_obj
 
+@xai_component(type='branch')
+class PlaywrightForEachUrl(Component):
+    """
+    Opens each URL of a list in a new page of a browser context and runs the body branch once per page,
+    in list order. Up to max_parallel pages are loaded concurrently on the worker, so the next pages are
+    already loading while the body works on the current one. Each page is closed after its body has run.
+
+    ##### inPorts:
+    - urls: The list of URLs to open.
+    - context: (Optional) The Playwright browser context to open the pages in. Retrieved from the context if not provided.
+    - max_parallel: (Optional) The maximum number of pages open at the same time (default: 3).
+
+    ##### outPorts:
+    - current_page: The page of the current URL. It is also the default page for the body's components.
+    - current_url: The current URL.
+    - current_index: The index of the current URL.
+
+    ##### Branches:
+    - body: Branch that executes for each page.
+    """
+    body: BaseComponent
+    urls: InArg[list]
+    context: InArg[any]
+    max_parallel: InArg[int]
+    current_page: OutArg[Page]
+    current_url: OutArg[str]
+    current_index: OutArg[int]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        urls = list(_get_or(self.urls, []))
+        context_obj = _get_or(self.context, ctx.get("context"))
+        max_parallel = _get_or(self.max_parallel, 3)
+
+        if not context_obj:
+            raise ValueError("Missing Playwright browser context.")
+        if max_parallel < 1:
+            raise ValueError("'max_parallel' must be at least 1.")
+        if not urls:
+            return
+
+        loaded = [concurrent.futures.Future() for _ in urls]
+        opened = []
+        state = {"stopped": False}
+
+        async def loader(queue):
+            slots = state["slots"]
+            while not queue.empty():
+                index, url = queue.get_nowait()
+                # A slot is held from loading a page until the body is done with it.
+                await slots.acquire()
+                if state["stopped"]:
+                    return
+                page = None
+                try:
+                    page = await context_obj.new_page()
+                    opened.append(page)
+                    await page.goto(url)
+                except Exception as e:
+                    # The slot goes back to the pool, so the failed page must not stay open.
+                    if page is not None:
+                        try:
+                            await page.close()
+                        except Exception as close_error:
+                            logger.warning("Could not close the page of %s: %s", url, close_error)
+                    slots.release()
+                    loaded[index].set_exception(e)
+                else:
+                    loaded[index].set_result(page)
+
+        async def load_all():
+            queue = asyncio.Queue()
+            for item in enumerate(urls):
+                queue.put_nowait(item)
+            await asyncio.gather(*(loader(queue) for _ in range(min(max_parallel, len(urls)))))
+
+        async def close_page(page):
+            await page.close()
+            state["slots"].release()
+
+        async def start_loading():
+            # Created on the worker's loop: on Python 3.9 asyncio primitives bind to the loop current at creation.
+            state["slots"] = asyncio.Semaphore(max_parallel)
+            state["loading"] = asyncio.ensure_future(load_all())
+
+        async def close_remaining():
+            state["stopped"] = True
+            for _ in range(max_parallel):
+                state["slots"].release()
+            await state["loading"]
+            for page in opened:
+                if not page.is_closed():
+                    await page.close()
+
+        _run(ctx, start_loading)
+        previous_page = ctx.get("page")
+        try:
+            for index, url in enumerate(urls):
+                page = loaded[index].result()
+                self.current_page.value = page
+                self.current_url.value = url
+                self.current_index.value = index
+                ctx["page"] = page
+                SubGraphExecutor(self.body).do(ctx)
+                _run(ctx, close_page, page)
+                logger.debug("Processed %s.", url)
+        finally:
+            ctx["page"] = previous_page
+            _run(ctx, close_remaining)
+        logger.info("Processed %s URLs with up to %s pages in parallel.", len(urls), max_parallel)
+
 @xai_component
 class PlaywrightCompileAndRunXircuits(Component):
     """
@@ -817,25 +2228,28 @@ class PlaywrightCompileAndRunXircuits(Component):
         if not page_obj:
             raise ValueError("Missing Playwright page instance.")
 
-        def compile_and_run(p):
+        async def compile_and_run(p):
+            # Each step waits for the element the next step needs instead of sleeping a fixed time.
             # Save
-            p.locator('jp-button[title="Save (Ctrl+S)"] >>> button').click()
-            p.wait_for_timeout(500)
+            await p.locator('jp-button[title="Save (Ctrl+S)"] >>> button').click()
 
             # Compile
-            p.locator('jp-button[title="Compile Xircuits"] >>> button').click()
-            p.wait_for_timeout(2000)
+            await p.locator('jp-button[title="Compile Xircuits"] >>> button').click()
+            run_button = p.locator('jp-button[title="Compile and Run Xircuits"] >>> button')
+            await run_button.wait_for(state="visible")
 
             # Compile and Run
-            p.locator('jp-button[title="Compile and Run Xircuits"] >>> button').click()
-            p.wait_for_timeout(1000)
-            p.click("div.jp-Dialog-buttonLabel:has-text('Start')")
-            p.wait_for_timeout(1000)
-            p.click("div.jp-Dialog-buttonLabel:has-text('Select')")
-            p.wait_for_timeout(1000)
-            print("Workflow saved, compiled, and running successfully.")
-
-        global_worker.run(compile_and_run, page_obj)
+            await run_button.click()
+            start_button = p.locator("div.jp-Dialog-buttonLabel:has-text('Start')")
+            await start_button.wait_for(state="visible", timeout=30000)
+            await start_button.click()
+            select_button = p.locator("div.jp-Dialog-buttonLabel:has-text('Select')")
+            await select_button.wait_for(state="visible", timeout=30000)
+            await select_button.click()
+            await select_button.wait_for(state="detached")
+            logger.info("Workflow saved, compiled, and running successfully.")
+
+        _run(ctx, compile_and_run, page_obj)
         self.out_page.value = page_obj
 
 
@@ -860,18 +2274,214 @@ class PlaywrightWaitForSplashAndClickXircuitsFile(Component):
         if not page_obj:
             raise ValueError("Missing Playwright page instance.")
 
-        def wait_and_click(p):
-            # Wait for splash screen to disappear
-            p.wait_for_selector('#jupyterlab-splash', state='detached')
-            print("Splash screen disappeared.")
-
-            # Click "Xircuits File"
-            p.get_by_text('Xircuits File', exact=True).click()
-            print("Clicked 'Xircuits File'.")
+        async def wait_and_click(p):
+            # The click retries until the button receives pointer events, i.e. until the splash screen
+            # no longer covers it, so no separate wait for the splash to detach is needed.
+            await p.get_by_text('Xircuits File', exact=True).click(timeout=60000)
+            logger.debug("Clicked 'Xircuits File'.")
 
-        global_worker.run(wait_and_click, page_obj)
+        _run(ctx, wait_and_click, page_obj)
         self.out_page.value = page_obj
 
+# Drag, connect and align helpers for the Xircuits canvas. They are installed once per page as window.__xai
+# (and re-installed on navigation by an init script), so each call only sends its arguments.
+# connect() resolves to true once the new link is on the canvas, or to false if none appears within 2 s.
+_XAI_HELPERS_JS = """
+(() => {
+  if (window.__xai) {
+      return;
+  }
+
+  function getCenter(el) {
+      const rect = el.getBoundingClientRect();
+      return { x: rect.left + rect.width / 2, y: rect.top + rect.height / 2 };
+  }
+
+  function fireEvent(el, type, clientX, clientY, dataTransfer) {
+      el.dispatchEvent(new DragEvent(type, {
+          bubbles: true,
+          cancelable: true,
+          composed: true,
+          clientX: clientX,
+          clientY: clientY,
+          dataTransfer: dataTransfer
+      }));
+  }
+
+  function dragTo(source, target, x, y) {
+      const dataTransfer = new DataTransfer();
+      const rect = target.getBoundingClientRect();
+      const clientX = rect.left + x;
+      const clientY = rect.top + y;
+
+      source.dispatchEvent(new DragEvent('dragstart', { dataTransfer, bubbles: true }));
+      target.dispatchEvent(new DragEvent('dragenter', { dataTransfer, bubbles: true, clientX, clientY }));
+      target.dispatchEvent(new DragEvent('dragover', { dataTransfer, bubbles: true, clientX, clientY }));
+      target.dispatchEvent(new DragEvent('drop', { dataTransfer, bubbles: true, clientX, clientY }));
+      source.dispatchEvent(new DragEvent('dragend', { dataTransfer, bubbles: true }));
+  }
+
+  function findNode(node) {
+      return document.querySelector(`div[data-default-node-name='${CSS.escape(node)}']`);
+  }
+
+  function findPort(node, port, nodes) {
+      // nodes optionally caches node elements by name across several lookups.
+      let nodeEl = nodes ? nodes.get(node) : undefined;
+      if (!nodeEl) {
+          nodeEl = document.querySelector(`div.node[data-default-node-name='${CSS.escape(node)}']`);
+          if (nodes) {
+              nodes.set(node, nodeEl);
+          }
+      }
+      return nodeEl ? nodeEl.querySelector(`div.port[data-name='${CSS.escape(port)}']`) : null;
+  }
+
+  function pathEnd(path, atStart) {
+      const point = path.getPointAtLength(atStart ? 0 : path.getTotalLength());
+      return new DOMPoint(point.x, point.y).matrixTransform(path.getScreenCTM());
+  }
+
+  function within(el, point) {
+      const rect = el.getBoundingClientRect();
+      const pad = 4;
+      return point.x >= rect.left - pad && point.x <= rect.right + pad &&
+          point.y >= rect.top - pad && point.y <= rect.bottom + pad;
+  }
+
+  function isLinked(sourceEl, targetEl) {
+      // Links carry no port ids in the DOM, so compare where each link's path starts and ends with the ports.
+      for (const link of document.querySelectorAll("[data-linkid]")) {
+          const paths = link.querySelectorAll("path");
+          if (!paths.length) {
+              continue;
+          }
+          const start = pathEnd(paths[0], true);
+          const end = pathEnd(paths[paths.length - 1], false);
+          if ((within(sourceEl, start) && within(targetEl, end)) || (within(sourceEl, end) && within(targetEl, start))) {
+              return true;
+          }
+      }
+      return false;
+  }
+
+  async function connectPorts({ sourceNode, sourcePort, targetNode, targetPort }, nodes) {
+      const sourceEl = findPort(sourceNode, sourcePort, nodes);
+      const targetEl = findPort(targetNode, targetPort, nodes);
+
+      if (!sourceEl || !targetEl) {
+          console.warn("Source or target port not found.");
+          return false;
+      }
+      if (isLinked(sourceEl, targetEl)) {
+          return true;
+      }
+
+      const from = getCenter(sourceEl);
+      const to = getCenter(targetEl);
+      const dataTransfer = new DataTransfer();
+
+      fireEvent(sourceEl, "mousedown", from.x, from.y, dataTransfer);
+      fireEvent(document, "mousemove", (from.x + to.x) / 2, (from.y + to.y) / 2, dataTransfer);
+      fireEvent(document, "mousemove", to.x, to.y, dataTransfer);
+      const canvas = document.querySelector(".xircuits-canvas") || document.body;
+      const linkCount = () => canvas.querySelectorAll("[data-linkid]").length;
+      const before = linkCount();
+      // Resolve once the new link is rendered, so the next step needs no sleep, or with false after 2 s.
+      const linked = new Promise(resolve => {
+          const done = () => {
+              observer.disconnect();
+              clearTimeout(timer);
+              resolve(linkCount() > before);
+          };
+          const observer = new MutationObserver(() => {
+              if (linkCount() > before) {
+                  done();
+              }
+          });
+          const timer = setTimeout(done, 2000);
+          observer.observe(canvas, { subtree: true, childList: true });
+      });
+
+      fireEvent(targetEl, "mouseup", to.x, to.y, dataTransfer);
+      return await linked;
+  }
+
+  window.__xai = {
+      drag(component, x, y) {
+          const source = [...document.querySelectorAll("[draggable='true']")]
+            .find(el => el.innerText.includes(component));
+          const target = document.querySelector(".xircuits-canvas");
+
+          if (!source || !target) {
+              console.warn("Component or canvas not found.");
+              return false;
+          }
+
+          dragTo(source, target, x, y);
+          target.click();
+          return true;
+      },
+
+      connect(connection) {
+          return connectPorts(connection);
+      },
+
+      async connectAll(connections) {
+          const nodes = new Map();
+          const results = [];
+          for (const connection of connections) {
+              results.push(await connectPorts(connection, nodes));
+          }
+          return results;
+      },
+
+      alignPoints({ start, target, direction, offset }) {
+          // Only measures; the drag itself is done with Playwright's mouse, whose events the canvas trusts.
+          const startEl = findNode(start);
+          const targetEl = findNode(target);
+
+          if (!startEl || !targetEl) {
+              return null;
+          }
+
+          const targetBox = targetEl.getBoundingClientRect();
+          return {
+              from: getCenter(startEl),
+              to: {
+                  x: direction === "left" ? targetBox.left - offset : targetBox.right + offset,
+                  y: targetBox.top + targetBox.height / 2
+              }
+          };
+      }
+  };
+})()
+"""
+
+# Entry points into the installed helpers; the variable parts are passed as the evaluate argument.
+_XAI_DRAG_JS = "(a) => window.__xai.drag(a.component, a.x, a.y)"
+_XAI_ALIGN_JS = "(a) => window.__xai.alignPoints(a)"
+_XAI_CONNECT_JS = "(a) => window.__xai.connect(a)"
+_XAI_CONNECT_ALL_JS = "(a) => window.__xai.connectAll(a)"
+
+_HELPER_PAGES = weakref.WeakSet()
+
+async def _ensure_xai_helpers(p):
+    """Installs _XAI_HELPERS_JS in the page once: in the current document and, for later navigations, as an init script."""
+    if p in _HELPER_PAGES:
+        return
+    await p.add_init_script(script=_XAI_HELPERS_JS)
+    await p.evaluate(_XAI_HELPERS_JS)
+    _HELPER_PAGES.add(p)
+
+async def _ensure_sidebar_open(p):
+    """Opens the component sidebar unless its tab is already the selected one."""
+    if await p.locator("[data-id='xircuits-component-sidebar'][aria-selected='true']").count():
+        return
+    # Clicking the selected tab would collapse the panel, so switch away to the table of contents first.
+    await p.locator("[data-id='table-of-contents']").click()
+    await p.locator("[data-id='xircuits-component-sidebar']").click()
+
 @xai_component
 class PlaywrightDragComponentToPosition(Component):
     """
@@ -883,6 +2493,7 @@ class PlaywrightDragComponentToPosition(Component):
     - component_name: The name of the component to drag.
     - drop_x: X coordinate on the canvas.
     - drop_y: Y coordinate on the canvas.
+    - use_native_drag: (Optional) Drag with Playwright's mouse instead of dispatching synthetic drag events in the page (default: False).
 
     ##### outPorts:
     - page: The updated Playwright page instance.
@@ -893,6 +2504,7 @@ class PlaywrightDragComponentToPosition(Component):
     component_name: InArg[str]
     drop_x: InArg[int]
     drop_y: InArg[int]
+    use_native_drag: InArg[bool]
     out_page: OutArg[Page]
 
     def execute(self, ctx) -> None:
@@ -903,53 +2515,33 @@ class PlaywrightDragComponentToPosition(Component):
         component = self.component_name.value
         x = self.drop_x.value
         y = self.drop_y.value
+        use_native_drag = _get_or(self.use_native_drag, False)
 
         if not page_obj or not library or not component:
             raise ValueError("Page, library name, and component name must be provided.")
 
-        def drag_component(p):
-            print(f"Opening library: {library}")
-            p.wait_for_selector("[data-id='table-of-contents']")
-            p.click("[data-id='table-of-contents']")
-            p.wait_for_selector("[data-id='xircuits-component-sidebar']")
-            p.click("[data-id='xircuits-component-sidebar']")
-            p.get_by_text(library, exact=True).click()
-            p.wait_for_timeout(1000)
-
-            print(f"Dragging component: {component} to ({x}, {y})")
-            p.evaluate(f"""
-            () => {{
-              const source = [...document.querySelectorAll("[draggable='true']")]
-                .find(el => el.innerText.includes("{component}"));
-              const target = document.querySelector(".xircuits-canvas");
-
-              if (!source || !target) {{
-                  console.warn("Component or canvas not found.");
-                  return;
-              }}
-
-              HTMLElement.prototype.dragTo = function(targetElement, x, y) {{
-                  const dataTransfer = new DataTransfer();
-                  const rect = targetElement.getBoundingClientRect();
-
-                  const clientX = rect.left + x;
-                  const clientY = rect.top + y;
-
-                  this.dispatchEvent(new DragEvent('dragstart', {{ dataTransfer, bubbles: true }}));
-                  targetElement.dispatchEvent(new DragEvent('dragenter', {{ dataTransfer, bubbles: true, clientX, clientY }}));
-                  targetElement.dispatchEvent(new DragEvent('dragover', {{ dataTransfer, bubbles: true, clientX, clientY }}));
-                  targetElement.dispatchEvent(new DragEvent('drop', {{ dataTransfer, bubbles: true, clientX, clientY }}));
-                  this.dispatchEvent(new DragEvent('dragend', {{ dataTransfer, bubbles: true }}));
-              }};
-
-              source.dragTo(target, {x}, {y});
-              target.click();
-            }}
-            """)
-
-        global_worker.run(drag_component, page_obj)
+        async def drag_component(p):
+            logger.debug("Opening library: %s", library)
+            # Locator clicks wait for each element to be actionable, and the drag starts once the component is listed.
+            await _ensure_sidebar_open(p)
+            # The sidebar tab's data-id is the panel's id; searching only the panel keeps the text scan small.
+            sidebar = p.locator("#xircuits-component-sidebar")
+            await sidebar.get_by_text(library, exact=True).click()
+            source = sidebar.locator("[draggable='true']", has_text=component).first
+            await source.wait_for()
+
+            logger.debug("Dragging component: %s to (%s, %s)", component, x, y)
+            if use_native_drag:
+                await source.drag_to(p.locator(".xircuits-canvas"), target_position={"x": x, "y": y})
+                return True
+            await _ensure_xai_helpers(p)
+            return await p.evaluate(_XAI_DRAG_JS, {"component": component, "x": x, "y": y})
+
+        if not _run(ctx, drag_component, page_obj):
+            logger.warning("Component %s or the canvas was not found.", component)
+        else:
+            logger.info("Component dragged and dropped successfully.")
         self.out_page.value = page_obj
-        print("Component dragged and dropped successfully.")
 
 @xai_component
 class PlaywrightAlignNode(Component):
@@ -979,40 +2571,34 @@ class PlaywrightAlignNode(Component):
         start_name = self.start_node_name.value
         target_name = self.target_node_name.value
         direction_value = (self.direction.value or 'left').lower()
-        offset_x_value = self.offset_x.value if self.offset_x.value is not None else 200
+        offset_x_value = _get_or(self.offset_x, 200)
 
         if not page_obj or not start_name or not target_name:
             raise ValueError("Missing page instance, start_node_name or target_node_name.")
 
-        def align_nodes(p):
-            start_node = p.locator(f"div[data-default-node-name='{start_name}']").nth(0)
-            target_node = p.locator(f"div[data-default-node-name='{target_name}']").nth(0)
-
-            start_box = start_node.bounding_box()
-            target_box = target_node.bounding_box()
-
-            if not start_box or not target_box:
+        if direction_value not in ('left', 'right'):
+            raise ValueError("direction must be either 'left' or 'right'")
+
+        async def align_nodes(p):
+            # Both nodes are measured in a single evaluate, then dragged with the mouse.
+            await _ensure_xai_helpers(p)
+            points = await p.evaluate(_XAI_ALIGN_JS, {
+                "start": start_name,
+                "target": target_name,
+                "direction": direction_value,
+                "offset": offset_x_value,
+            })
+            if not points:
                 raise ValueError("Could not find bounding boxes for nodes.")
 
-            target_center_y = target_box['y'] + target_box['height'] / 2
-
-            if direction_value == 'left':
-                move_to_x = target_box['x'] - offset_x_value
-            elif direction_value == 'right':
-                move_to_x = target_box['x'] + target_box['width'] + offset_x_value
-            else:
-                raise ValueError("direction must be either 'left' or 'right'")
-
-            move_to_y = target_center_y
-
-            start_node.hover()
-            p.mouse.down()
-            p.mouse.move(move_to_x, move_to_y, steps=10)
-            p.mouse.up()
+            await p.mouse.move(points["from"]["x"], points["from"]["y"])
+            await p.mouse.down()
+            await p.mouse.move(points["to"]["x"], points["to"]["y"], steps=10)
+            await p.mouse.up()
 
-            print(f"Moved {start_name} to the {direction_value} of {target_name} with offset {offset_x_value}.")
+            logger.debug("Moved %s to the %s of %s with offset %s.", start_name, direction_value, target_name, offset_x_value)
 
-        global_worker.run(align_nodes, page_obj)
+        _run(ctx, align_nodes, page_obj)
         self.out_page.value = page_obj
 
 @xai_component
@@ -1049,53 +2635,78 @@ class PlaywrightConnectNodes(Component):
         if not page_obj:
             raise ValueError("Missing Playwright page instance.")
 
-        def connect(p):
-            return p.evaluate(f"""
-            () => {{
-                function getCenter(el) {{
-                    const rect = el.getBoundingClientRect();
-                    return {{ x: rect.left + rect.width / 2, y: rect.top + rect.height / 2 }};
-                }}
-
-                const sourcePort = document.querySelector("div.node[data-default-node-name='{source_node_value}'] div.port[data-name='{source_port_value}']");
-                let targetPort = document.querySelector("div.node[data-default-node-name='{target_node_value}'] div.port[data-name='{target_port_value}']");
-
-                if (!sourcePort || !targetPort) {{
-                    console.warn("Source or target port not found.");
-                    return false;
-                }}
-
-                const from = getCenter(sourcePort);
-                const to = getCenter(targetPort);
-                const dataTransfer = new DataTransfer();
-
-                function fireEvent(el, type, clientX, clientY) {{
-                    const event = new DragEvent(type, {{
-                        bubbles: true,
-                        cancelable: true,
-                        composed: true,
-                        clientX: clientX,
-                        clientY: clientY,
-                        dataTransfer: dataTransfer
-                    }});
-                    el.dispatchEvent(event);
-                }}
-
-                fireEvent(sourcePort, "mousedown", from.x, from.y);
-                fireEvent(document, "mousemove", (from.x + to.x) / 2, (from.y + to.y) / 2);
-                fireEvent(document, "mousemove", to.x, to.y);
-                fireEvent(targetPort, "mouseup", to.x, to.y);
-
-                return true;
-            }}
-            """)
-
-        result = global_worker.run(connect, page_obj)
+        async def connect(p):
+            await _ensure_xai_helpers(p)
+            return await p.evaluate(_XAI_CONNECT_JS, {
+                "sourceNode": source_node_value,
+                "sourcePort": source_port_value,
+                "targetNode": target_node_value,
+                "targetPort": target_port_value,
+            })
+
+        result = _run(ctx, connect, page_obj)
 
         if result:
-            print(f"Successfully connected {source_node_value} to {target_node_value}.")
+            logger.info("Successfully connected %s to %s.", source_node_value, target_node_value)
         else:
-            print(f"Failed to connect {source_node_value} to {target_node_value}.")
+            logger.warning("Failed to connect %s to %s.", source_node_value, target_node_value)
 
         self.out_page.value = page_obj
 
+@xai_component
+class PlaywrightConnectNodesBatch(Component):
+    """
+    Connects several pairs of ports on the Xircuits canvas in a single call, instead of one
+    PlaywrightConnectNodes per edge. Each node is looked up once however many edges use it.
+
+    inPorts:
+    - page: The Playwright page instance.
+    - connections: A list of connections, each either a list [source_node, source_port, target_node, target_port]
+                   or a dictionary with those keys,
+                   e.g. [["Start", "out-0", "Literal String", "in-0"], ["Literal String", "out-0", "Finish", "in-0"]].
+
+    outPorts:
+    - page: The updated Playwright page instance.
+    - results: A list of booleans telling whether each connection was made.
+    """
+    page: InArg[Page]
+    connections: InArg[list]
+    out_page: OutArg[Page]
+    results: OutArg[list]
+
+    def execute(self, ctx) -> None:
+        global global_worker
+        page_obj = _get_or(self.page, ctx.get("page"))
+        connections_value = _get_or(self.connections, [])
+
+        if not page_obj:
+            raise ValueError("Missing Playwright page instance.")
+
+        connections = []
+        for connection in connections_value:
+            if isinstance(connection, dict):
+                connection = [connection.get(key) for key in ("source_node", "source_port", "target_node", "target_port")]
+            if len(connection) != 4 or not all(connection):
+                raise ValueError(f"Invalid connection: {connection}. Expected source_node, source_port, target_node and target_port.")
+            source_node, source_port, target_node, target_port = connection
+            connections.append({
+                "sourceNode": source_node,
+                "sourcePort": source_port,
+                "targetNode": target_node,
+                "targetPort": target_port,
+            })
+
+        async def connect_all(p):
+            await _ensure_xai_helpers(p)
+            return await p.evaluate(_XAI_CONNECT_ALL_JS, connections)
+
+        results = _run(ctx, connect_all, page_obj) if connections else []
+        for connection, connected in zip(connections, results):
+            if connected:
+                logger.debug("Connected %s to %s.", connection["sourceNode"], connection["targetNode"])
+            else:
+                logger.warning("Failed to connect %s to %s.", connection["sourceNode"], connection["targetNode"])
+        logger.info("Connected %s of %s node pairs.", sum(1 for r in results if r), len(connections))
+
+        self.results.value = results
+        self.out_page.value = page_obj